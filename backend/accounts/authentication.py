@@ -0,0 +1,149 @@
+"""
+JWT authentication without a User lookup per request.
+
+Access tokens issued by VerifiedTokenObtainPairView carry role, is_verified
+and supervisor_id claims (user_claims). ClaimsJWTAuthentication turns them
+into a ClaimsUser, so permission checks and `*_id=request.user.id` filters
+need no query. Tokens issued before the claims existed fall back to the
+normal row lookup.
+
+Claims are frozen for the life of the token (and copied into refreshed
+access tokens), so every token also carries the user's token_version. Write
+paths that change role/supervisor/active state or delete users call
+refresh_claims(...), which increments User.token_version in the same
+transaction. Each request compares the token's version with the current
+one, read from the cache (AUTH_CLAIMS_CACHE_TTL seconds, dropped after the
+change commits) or, on a miss, from the database: a missing row rejects the
+token, an inactive user is rejected, and an older version gets its claims
+from the row instead of the token. A cache miss or eviction therefore costs
+one query, never a stale answer.
+
+The full row is available through full_user(request.user), optionally kept
+for AUTH_USER_CACHE_TTL seconds.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+CLAIMS = ("role", "is_verified", "supervisor_id")
+VERSION_CLAIM = "ver"
+
+
+def user_claims(user):
+    return {
+        "role": user.role,
+        "is_verified": user.is_verified,
+        "supervisor_id": user.supervisor_id,
+        VERSION_CLAIM: user.token_version,
+    }
+
+
+def _claims_key(user_id):
+    return f"auth:claims:{user_id}"
+
+
+def _user_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def refresh_claims(*user_ids):
+    """
+    Invalidate the claims in tokens already issued to `user_ids`: bump their
+    token_version now (inside the caller's transaction) and drop the cached
+    state and rows once it commits.
+    """
+    if not user_ids:
+        return
+    User.objects.filter(id__in=user_ids).update(token_version=F("token_version") + 1)
+
+    def _drop():
+        cache.delete_many([_claims_key(uid) for uid in user_ids] + [_user_key(uid) for uid in user_ids])
+    transaction.on_commit(_drop)
+
+
+def current_claims(user_id):
+    """{token_version, is_active, *CLAIMS} of the row, or None if it is gone (cache, then DB)."""
+    key = _claims_key(user_id)
+    ttl = getattr(settings, "AUTH_CLAIMS_CACHE_TTL", 60)
+    state = cache.get(key) if ttl else None
+    if state is None:
+        row = User.objects.filter(id=user_id).values("token_version", "is_active", *CLAIMS).first()
+        state = row or {"deleted": True}
+        if ttl:
+            cache.set(key, state, ttl)
+    return None if state.get("deleted") else state
+
+
+class ClaimsUser(TokenUser):
+    def __init__(self, token, overrides=None):
+        super().__init__(token)
+        self.claims = {k: token.get(k) for k in CLAIMS}
+        self.claims.update({k: v for k, v in (overrides or {}).items() if k in CLAIMS})
+
+    def __str__(self):
+        return f"ClaimsUser {self.id}"
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @property
+    def role(self):
+        return self.claims["role"]
+
+    @property
+    def is_verified(self):
+        return bool(self.claims["is_verified"])
+
+    @property
+    def supervisor_id(self):
+        return self.claims["supervisor_id"]
+
+    @cached_property
+    def supervisor(self):
+        if not self.supervisor_id:
+            return None
+        return User.objects.filter(id=self.supervisor_id).first()
+
+
+def full_user(user):
+    """The User row behind request.user (cached for AUTH_USER_CACHE_TTL seconds)."""
+    if isinstance(user, User):
+        return user
+
+    ttl = getattr(settings, "AUTH_USER_CACHE_TTL", 0)
+    row = cache.get(_user_key(user.id)) if ttl else None
+    if row is None:
+        row = User.objects.get(id=user.id)
+        if ttl:
+            cache.set(_user_key(user.id), row, ttl)
+    return row
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if "role" not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise AuthenticationFailed("Token contained no recognizable user identification", code="token_not_valid")
+
+        state = current_claims(user_id)
+        if state is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not state["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        # claims changed since the token was issued: the row wins
+        overrides = state if validated_token.get(VERSION_CLAIM) != state["token_version"] else None
+        return ClaimsUser(validated_token, overrides)
@@ -0,0 +1,43 @@
+"""
+Account emails. Everything goes through the outbox (accounts/outbox.py) and
+is delivered by `send_outbox`.
+"""
+from django.conf import settings
+
+from .models import User, EmailVerificationToken
+from .outbox import enqueue
+from .tokens import new_token
+
+
+def send_verification_email(user: User):
+    token = new_token(16)
+    EmailVerificationToken.objects.create(user=user, token=token)
+
+    verify_url = f"{settings.FRONTEND_BASE_URL}/verify.html?token={token}"
+    subject = "Verify your Codavatar InternTrack account"
+    message = f"Hello {user.full_name},\n\nPlease verify your account:\n{verify_url}\n\n- Codavatar Tech"
+    enqueue(user.email, subject, message)
+
+
+def send_reset_email(user: User, token: str):
+    reset_url = f"{settings.FRONTEND_BASE_URL}/reset_password.html?token={token}"
+    subject = "Reset your Codavatar InternTrack password"
+    message = f"Hello {user.full_name},\n\nReset your password using this link:\n{reset_url}\n\n- Codavatar Tech"
+    enqueue(user.email, subject, message)
+
+
+def credentials_message(user: User, password: str):
+    subject = "Your Codavatar InternTrack Login Credentials"
+    message = (
+        f"Hello {user.full_name},\n\n"
+        f"Your account has been created by Codavatar Tech.\n"
+        f"Email: {user.email}\n"
+        f"Password: {password}\n\n"
+        f"Login: {settings.FRONTEND_BASE_URL}/login.html\n\n"
+        f"- Codavatar Tech"
+    )
+    return user.email, subject, message
+
+
+def send_credentials_email(user: User, password: str):
+    enqueue(*credentials_message(user, password))
@@ -0,0 +1,82 @@
+"""
+Parallel password hashing for bulk user provisioning.
+
+PBKDF2 at Django's default work factor is deliberately slow (hundreds of ms
+per password), and it is pure CPU, so a CSV import of a whole cohort is
+bounded by hashing. hash_passwords() spreads make_password() over a process
+pool sized to the usable cores (PASSWORD_HASH_WORKERS to override) and
+returns encoded hashes ready for User(password=...) + bulk_create. Callers
+hashing in several batches can keep one hash_pool() open across them.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from .models import User
+
+# below this the pool start-up costs more than it saves
+MIN_PARALLEL = 4
+
+
+def usable_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def _init_worker(settings_module):
+    # no-op for fork; spawn/forkserver children start without Django configured
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+        django.setup()
+
+
+def hash_pool(workers=None):
+    """
+    A process pool to reuse across several hash_passwords() calls (e.g. one
+    per import batch), or None when hashing would run in-process anyway.
+    """
+    workers = workers or getattr(settings, "PASSWORD_HASH_WORKERS", 0) or usable_cores()
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "backend.settings"),),
+    )
+
+
+def hash_passwords(passwords, workers=None, pool=None):
+    """make_password() for each raw password, in order."""
+    passwords = list(passwords)
+    if pool is not None:
+        if len(passwords) < MIN_PARALLEL:
+            return [make_password(p) for p in passwords]
+        chunksize = max(1, len(passwords) // (pool._max_workers * 4))
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+    workers = workers or getattr(settings, "PASSWORD_HASH_WORKERS", 0) or usable_cores()
+    workers = min(workers, len(passwords))
+
+    if workers <= 1 or len(passwords) < MIN_PARALLEL:
+        return [make_password(p) for p in passwords]
+
+    with hash_pool(workers) as pool:
+        return hash_passwords(passwords, pool=pool)
+
+
+def bulk_create_users(pending, batch_size=500, pool=None):
+    """pending: [(unsaved User, raw password)] -> hash in parallel, then one bulk_create."""
+    hashes = hash_passwords((raw for _, raw in pending), pool=pool)
+    users = []
+    for (user, _), encoded in zip(pending, hashes):
+        user.password = encoded
+        users.append(user)
+    # no pks come back on MySQL; look rows up by email if ids are needed
+    return User.objects.bulk_create(users, batch_size=batch_size)
@@ -0,0 +1,178 @@
+"""
+CSV user imports as background jobs.
+
+The upload view only streams the file to IMPORT_UPLOAD_DIR, checks the
+header and queues an ImportJob; `manage.py run_import_jobs` (started next to
+gunicorn, no broker needed) claims queued jobs from the table and runs
+UserImporter over the saved file. Progress and counters are written to the
+job row after every batch, which doubles as a heartbeat: a RUNNING job that
+has not moved for IMPORT_JOB_STALE_SECONDS (worker died) is claimed again.
+
+Batches commit one by one, so a failed job keeps the batches it finished;
+re-running the same file is safe because existing users are only updated.
+"""
+import csv
+import logging
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.cache import bump_scopes
+
+from .authentication import refresh_claims
+from .emails import credentials_message
+from .importer import CSVImportError, UserImporter
+from .models import ImportJob
+from .outbox import enqueue_many
+
+logger = logging.getLogger(__name__)
+
+
+def upload_dir() -> Path:
+    return Path(settings.IMPORT_UPLOAD_DIR)
+
+
+def _open_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def _read_header(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return next(csv.reader(f), None)
+
+
+def create_job(upload, user_id, dry_run=False):
+    """Save an UploadedFile to disk and queue it. Raises CSVImportError on a bad header."""
+    root = upload_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    path = root / f"{uuid.uuid4().hex}.csv"
+
+    with open(path, "wb") as out:
+        for chunk in upload.chunks():
+            out.write(chunk)
+
+    try:
+        header = _read_header(path)
+        if not header:
+            raise CSVImportError("CSV has no header.")
+        UserImporter(header)  # validates required columns
+    except (CSVImportError, UnicodeDecodeError, csv.Error) as e:
+        path.unlink(missing_ok=True)
+        if isinstance(e, CSVImportError):
+            raise
+        raise CSVImportError(f"Could not read CSV: {e}")
+
+    return ImportJob.objects.create(
+        created_by_id=user_id,
+        file_path=str(path),
+        original_name=(upload.name or "")[:255],
+        dry_run=dry_run,
+    )
+
+
+def claim_next():
+    stale = timezone.now() - timedelta(seconds=settings.IMPORT_JOB_STALE_SECONDS)
+    with transaction.atomic():
+        job = (
+            ImportJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(Q(status="QUEUED") | Q(status="RUNNING", updated_at__lt=stale))
+            .order_by("created_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        now = timezone.now()
+        job.status = "RUNNING"
+        job.started_at = now
+        job.updated_at = now
+        job.save(update_fields=["status", "started_at", "updated_at"])
+        return job
+
+
+def _save_progress(job, importer, **extra):
+    fields = dict(
+        rows_total=importer.rows_total,
+        rows_processed=importer.rows_processed,
+        created_count=importer.created,
+        updated_count=importer.updated,
+        credentials_sent=0 if importer.dry_run else importer.created,
+        errors_count=importer.errors_count,
+        errors=importer.errors,
+        diff=importer.diff,
+        updated_at=timezone.now(),
+        **extra,
+    )
+    ImportJob.objects.filter(id=job.id).update(**fields)
+
+
+def run_job(job):
+    path = job.file_path
+
+    def on_created(pending):
+        enqueue_many(credentials_message(user, pwd) for user, pwd in pending)
+
+    try:
+        header = _read_header(path)
+        importer = UserImporter(
+            header,
+            batch_size=settings.IMPORT_BATCH_SIZE,
+            dry_run=job.dry_run,
+            on_created=on_created,
+            # role/supervisor changes reach issued tokens as each batch commits
+            on_changed=lambda ids: refresh_claims(*ids),
+            on_progress=lambda imp: _save_progress(job, imp),
+            max_errors=settings.IMPORT_JOB_MAX_ERRORS,
+            max_diff=settings.IMPORT_JOB_MAX_DIFF,
+        )
+        importer.run(lambda: _open_rows(path))
+    except Exception as e:
+        logger.exception("Import job %s failed", job.id)
+        ImportJob.objects.filter(id=job.id).update(
+            status="FAILED", detail=f"{type(e).__name__}: {e}"[:2000],
+            finished_at=timezone.now(), updated_at=timezone.now(),
+        )
+        if not job.dry_run:
+            bump_scopes("users")  # earlier batches may have committed
+        return False
+
+    _save_progress(job, importer, status="DONE", finished_at=timezone.now(), detail="CSV import completed.")
+    if not job.dry_run:
+        bump_scopes("users")
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    return True
+
+
+def job_payload(job, full=True):
+    """API view of a job; full=False leaves out errors/diff (safe on .defer("errors", "diff"))."""
+    payload = {
+        "id": job.id,
+        "status": job.status,
+        "dry_run": job.dry_run,
+        "file": job.original_name,
+        "rows_total": job.rows_total,
+        "rows_processed": job.rows_processed,
+        "progress": round(job.rows_processed / job.rows_total, 3) if job.rows_total else None,
+        "created": job.created_count,
+        "updated": job.updated_count,
+        "credentials_sent": job.credentials_sent,
+        "errors_count": job.errors_count,
+        "detail": job.detail,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+    if full:
+        payload["errors"] = job.errors[:50]
+        payload["diff"] = job.diff if job.dry_run else None
+    return payload
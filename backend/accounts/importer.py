@@ -0,0 +1,264 @@
+"""
+Set-based user import for the company CSV
+(email, full_name, role, employee_id, department, supervisor_email).
+
+The file is streamed twice: supervisor rows first, so interns can point at
+supervisors created by the same file, then everything else. Rows are
+applied in batches with a fixed number of queries each:
+
+    existing users     one email__in query
+    new users          passwords hashed in parallel, bulk_create
+    changed users      bulk_update, grouped by the set of changed fields
+    supervisor links   one email__in query for emails not resolved yet
+
+Only the current batch and the set of emails already seen are held in
+memory. Update rules are the ones the per-row import used: names and roles
+are overwritten, employee_id/department only when the CSV has a value, the
+supervisor only when the CSV names a known supervisor, and every imported
+user ends up verified.
+
+With dry_run=True nothing is written; `diff` lists what would change.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .hashing import bulk_create_users
+from .models import User
+from .tokens import new_token
+
+REQUIRED_COLUMNS = ("email", "full_name", "role")
+ROLES = ("SUPERVISOR", "INTERN")
+BATCH_SIZE = 1000
+DIFF_FIELDS = ("full_name", "role", "employee_id", "department", "supervisor", "is_verified")
+
+
+class CSVImportError(Exception):
+    pass
+
+
+def header_map(fieldnames):
+    """Lower-cased, stripped column name -> the header as it appears in the file."""
+    columns = {}
+    for name in fieldnames or []:
+        if name:
+            columns.setdefault(name.strip().lower(), name)
+    for required in REQUIRED_COLUMNS:
+        if required not in columns:
+            raise CSVImportError(f"CSV missing required column: {required}")
+    return columns
+
+
+def _chunks(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class UserImporter:
+    """
+    importer = UserImporter(reader.fieldnames)
+    importer.run(lambda: csv.DictReader(open(path, newline="")))
+
+    on_created(pending) is called inside each batch's transaction with the
+    [(User, raw password)] pairs just inserted, on_changed(ids) with the ids
+    of existing users it updated; on_progress(importer) after each batch.
+    Each batch commits on its own.
+    """
+
+    def __init__(self, fieldnames, batch_size=BATCH_SIZE, dry_run=False,
+                 on_created=None, on_changed=None, on_progress=None, max_errors=None, max_diff=500):
+        self.columns = header_map(fieldnames)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.on_created = on_created
+        self.on_changed = on_changed
+        self.on_progress = on_progress
+        self.max_errors = max_errors
+        self.max_diff = max_diff
+
+        self.rows_total = None
+        self.rows_processed = 0
+        self.created = 0
+        self.updated = 0
+        self.errors_count = 0
+        self.errors = []
+        self.diff = []
+
+        self._seen = set()
+        self._supervisor_ids = {}
+
+    def _val(self, row, key):
+        column = self.columns.get(key)
+        return (row.get(column) or "").strip() if column else ""
+
+    def _error(self, email, error):
+        self.errors_count += 1
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append({"email": email, "error": error})
+
+    # ---------- streaming ----------
+    def run(self, open_rows):
+        """open_rows() must return a fresh iterator of row dicts; it is called once per pass."""
+        rows_seen = 0
+        for n, role in enumerate(ROLES):
+            first_pass = n == 0
+
+            def records(rows):
+                nonlocal rows_seen
+                for row in rows:
+                    if first_pass:
+                        rows_seen += 1
+                    row_role = self._val(row, "role").upper()
+                    if (row_role == "SUPERVISOR") != (role == "SUPERVISOR"):
+                        continue
+                    self.rows_processed += 1
+                    rec = self._record(row, row_role)
+                    if rec is not None:
+                        yield rec
+
+            for batch in _chunks(records(open_rows()), self.batch_size):
+                self._apply_batch(role, batch)
+                self._progress()
+
+            if first_pass:
+                self.rows_total = rows_seen
+                self._progress()
+        return self
+
+    def _progress(self):
+        if self.on_progress:
+            self.on_progress(self)
+
+    def _record(self, row, role):
+        if role not in ROLES:
+            return None  # other roles are not imported
+
+        email = self._val(row, "email").lower()
+        full_name = self._val(row, "full_name")
+        if not email or not full_name:
+            self._error(email, "Missing email/full_name")
+            return None
+        if email in self._seen:
+            self._error(email, "Duplicate email in CSV")
+            return None
+        self._seen.add(email)
+
+        return {
+            "email": email,
+            "full_name": full_name,
+            "employee_id": self._val(row, "employee_id"),
+            "department": self._val(row, "department"),
+            "supervisor_email": self._val(row, "supervisor_email").lower(),
+        }
+
+    # ---------- apply ----------
+    def _apply_batch(self, role, batch):
+        if role == "INTERN":
+            self._resolve_supervisors({r["supervisor_email"] for r in batch} - {""})
+            for rec in batch:
+                rec["supervisor_id"] = self._supervisor_ids.get(rec["supervisor_email"])
+
+        if self.dry_run:
+            self._apply(role, batch)
+        else:
+            with transaction.atomic():
+                self._apply(role, batch)
+
+    def _resolve_supervisors(self, emails):
+        missing = [e for e in emails if e not in self._supervisor_ids]
+        if missing:
+            self._supervisor_ids.update(
+                User.objects.filter(email__in=missing, role="SUPERVISOR").values_list("email", "id")
+            )
+
+    def _apply(self, role, batch):
+        existing = {u.email: u for u in User.objects.filter(email__in=[r["email"] for r in batch])}
+        new = []
+        changed = defaultdict(list)
+
+        for rec in batch:
+            user = existing.get(rec["email"])
+            if user is None:
+                new.append((User(
+                    email=rec["email"],
+                    full_name=rec["full_name"],
+                    role=role,
+                    employee_id=rec["employee_id"],
+                    department=rec["department"],
+                    supervisor_id=rec.get("supervisor_id"),
+                    is_verified=True,  # company/admin data => auto-verified
+                ), None))
+                if self.dry_run:
+                    self._diff(rec["email"], "create", {"role": role, "supervisor": rec.get("supervisor_id")})
+                continue
+
+            before = {f: getattr(user, "supervisor_id" if f == "supervisor" else f) for f in DIFF_FIELDS}
+            fields = self._update(user, role, rec)
+            if fields:
+                changed[tuple(fields)].append(user)
+                if self.dry_run:
+                    self._diff(user.email, "update", {
+                        f: [before[f], rec["supervisor_id"] if f == "supervisor" else getattr(user, f)]
+                        for f in fields
+                    })
+
+        if role == "SUPERVISOR" and self.dry_run:
+            # interns in this file may point at supervisors that would be created now
+            for user, _ in new:
+                self._supervisor_ids[user.email] = f"new:{user.email}"
+
+        if not self.dry_run:
+            if new:
+                new = [(user, new_token(10)) for user, _ in new]
+                bulk_create_users(new, batch_size=self.batch_size)
+                if self.on_created:
+                    self.on_created(new)
+                if role == "SUPERVISOR":
+                    self._supervisor_ids.update(
+                        User.objects.filter(email__in=[u.email for u, _ in new]).values_list("email", "id")
+                    )
+            now = timezone.now()  # bulk_update skips auto_now
+            for fields, users in changed.items():
+                for user in users:
+                    user.updated_at = now
+                User.objects.bulk_update(users, [*fields, "updated_at"], batch_size=self.batch_size)
+            if changed and self.on_changed:
+                self.on_changed([user.id for users in changed.values() for user in users])
+
+        self.created += len(new)
+        self.updated += sum(len(users) for users in changed.values())
+
+    def _diff(self, email, action, changes):
+        if len(self.diff) < self.max_diff:
+            self.diff.append({"email": email, "action": action, "changes": changes})
+
+    @staticmethod
+    def _update(user, role, rec):
+        fields = []
+        if user.full_name != rec["full_name"]:
+            user.full_name = rec["full_name"]
+            fields.append("full_name")
+        if user.role != role:
+            user.role = role
+            fields.append("role")
+        if rec["employee_id"] and user.employee_id != rec["employee_id"]:
+            user.employee_id = rec["employee_id"]
+            fields.append("employee_id")
+        if rec["department"] and user.department != rec["department"]:
+            user.department = rec["department"]
+            fields.append("department")
+        if rec.get("supervisor_id") and user.supervisor_id != rec["supervisor_id"]:
+            if not isinstance(rec["supervisor_id"], str):  # "new:<email>" only exists in dry runs
+                user.supervisor_id = rec["supervisor_id"]
+            fields.append("supervisor")
+        if not user.is_verified:
+            user.is_verified = True
+            fields.append("is_verified")
+        return fields
@@ -1,9 +1,12 @@
 import csv
 import secrets
+import time
 from pathlib import Path
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from accounts.hashing import bulk_create_users, hash_pool
 from accounts.models import User
+from core.cache import bump_scopes
 
 def _clean(s: str) -> str:
     return (s or "").strip()
@@ -24,7 +27,10 @@ def _role_from_header_cell(cell: str) -> str | None:
         return "ADMIN"
     return None
 
-def _create_user_from_block(block: dict, role: str, stdout):
+BLOCK_KEYS = {"name", "email", "id info", "position", "department", "employee id"}
+
+
+def _user_from_block(block: dict, role: str, existing: set):
     email = _clean(block.get("email", "")).lower()
     if not email:
         return None, "skipped(no email)"
@@ -33,33 +39,59 @@ def _create_user_from_block(block: dict, role: str, stdout):
     employee_id = _clean(block.get("id info", "")) or _clean(block.get("employee id", ""))
     department = _clean(block.get("position", "")) or _clean(block.get("department", ""))
 
-    if User.objects.filter(email=email).exists():
+    if email in existing:
         return None, "skipped(exists)"
 
-    password = secrets.token_urlsafe(8)
-
-    user = User.objects.create_user(
+    user = User(
         email=email,
-        password=password,
         full_name=full_name,
         role=role,
         employee_id=employee_id,
         department=department,
         is_verified=True,  # CSV-provisioned users are verified
     )
-
-    # Print creds like your screenshot
-    stdout.write(f"{email} | {password} | {employee_id or '-'} | {department or '-'}")
     return user, "created"
 
+
+def _user_from_row(row: dict):
+    email = (_clean(row.get("E-mail")) or _clean(row.get("Email"))).lower()
+    if not email:
+        return None
+
+    role_raw = _clean(row.get("Role", "")).lower()
+    if "supervisor" in role_raw:
+        role = "SUPERVISOR"
+    elif "admin" in role_raw:
+        role = "ADMIN"
+    else:
+        role = "INTERN"
+
+    return User(
+        email=email,
+        full_name=_clean(row.get("Intern Name") or row.get("Name") or email.split("@")[0]),
+        role=role,
+        employee_id=_clean(row.get("ID Info") or row.get("Employee ID") or ""),
+        department=_clean(row.get("Department") or ""),
+        is_verified=True,
+    )
+
+
+def _is_header(r) -> bool:
+    joined = " ".join([_clean(x).lower() for x in r])
+    return "e-mail" in joined or "email" in joined
+
+
 class Command(BaseCommand):
     help = "Import users from the Codavatar CSV (block-style + tabular). Prints generated credentials."
 
     def add_arguments(self, parser):
         parser.add_argument("--path", required=True, help="Path to CSV file")
         parser.add_argument("--dry-run", action="store_true", help="Parse only, do not write DB")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users hashed and inserted per batch")
+        parser.add_argument("--workers", type=int, default=0,
+                            help="Password hashing processes (default PASSWORD_HASH_WORKERS / all cores)")
+        parser.add_argument("--stats", action="store_true", help="Report rows/sec and time spent hashing/inserting")
 
-    @transaction.atomic
     def handle(self, *args, **opts):
         path = Path(opts["path"])
         if not path.exists():
@@ -67,15 +99,47 @@ class Command(BaseCommand):
             return
 
         dry = opts["dry_run"]
+        batch_size = max(1, opts["batch_size"])
+        started = time.perf_counter()
+        write_seconds = 0.0
 
-        # Read as raw rows
-        with path.open("r", encoding="utf-8", errors="ignore", newline="") as f:
-            rows = list(csv.reader(f))
+        # one query instead of an exists() per row; grows as rows are queued, so
+        # existing users and repeats within the CSV are skipped (dry run too)
+        existing = set(User.objects.values_list("email", flat=True))
 
+        rows_read = 0
         created = 0
         skipped = 0
+        # (User, password) pairs waiting for the next batch insert
+        pending = []
+        pool = None if dry else hash_pool(opts["workers"] or None)
 
-        # -------------- 1) BLOCK MODE (Supervisor/Intern blocks) --------------
+        def flush_pending():
+            nonlocal write_seconds, pending
+            if not pending:
+                return
+            t = time.perf_counter()
+            with transaction.atomic():
+                bulk_create_users(pending, batch_size=batch_size, pool=pool)
+            write_seconds += time.perf_counter() - t
+            # Print creds like your screenshot
+            for user, password in pending:
+                self.stdout.write(f"{user.email} | {password} | {user.employee_id or '-'} | {user.department or '-'}")
+            pending = []
+
+        def queue(user):
+            if user.email in existing:
+                return False
+            existing.add(user.email)
+            if dry:
+                self.stdout.write(f"[DRY] {user.email} role={user.role}")
+                return True
+            pending.append((user, secrets.token_urlsafe(8)))
+            if len(pending) >= batch_size:
+                flush_pending()
+            return True
+
+        # -------------- BLOCK MODE (Supervisor/Intern blocks) --------------
         role = None
         block = {}
 
@@ -87,98 +151,75 @@ class Command(BaseCommand):
             if not block:
                 return
 
-            if dry:
-                self.stdout.write(f"[DRY] {role} block -> {block}")
-                block = {}
-                return
-
-            user, status = _create_user_from_block(block, role, self.stdout)
-            if status.startswith("created"):
+            user, status = _user_from_block(block, role, existing)
+            if status.startswith("created") and queue(user):
                 created += 1
             else:
                 skipped += 1
             block = {}
 
-        for r in rows:
-            if not r:
-                continue
+        # -------------- TABULAR MODE (normal table with headers) --------------
+        # the first row mentioning an email column is the header; rows after it are records
+        header = None
 
-            first = _clean(r[0])
-            if not first:
-                continue
-
-            # detect role line: "Supervisor ,,,,,,,"
-            new_role = _role_from_header_cell(first)
-            if new_role:
-                flush_block()
-                role = new_role
-                block = {}
-                continue
-
-            # detect key,value lines: "Name: ,Samip Gajurel"
-            if len(r) >= 2:
-                k = _norm_key(r[0])
-                v = _clean(r[1])
-                if k in {"name", "email", "id info", "position", "department", "employee id"}:
-                    if v:
-                        block[k] = v
-
-        flush_block()
-
-        # -------------- 2) TABULAR MODE (normal table with headers) --------------
-        # find header row containing email column
-        header_idx = None
-        for i, r in enumerate(rows):
-            joined = " ".join([_clean(x).lower() for x in r])
-            if "e-mail" in joined or "email" in joined:
-                header_idx = i
-                break
-
-        if header_idx is not None:
-            # rebuild DictReader from that point onward
-            text_lines = []
-            for r in rows[header_idx:]:
-                text_lines.append(",".join([x.replace(",", " ") for x in r]))
-
-            dict_reader = csv.DictReader(text_lines)
-            for row in dict_reader:
-                email = (_clean(row.get("E-mail")) or _clean(row.get("Email"))).lower()
-                if not email:
-                    continue
-                if User.objects.filter(email=email).exists():
-                    skipped += 1
-                    continue
-
-                role_raw = _clean(row.get("Role", "")).lower()
-                if "supervisor" in role_raw:
-                    role2 = "SUPERVISOR"
-                elif "admin" in role_raw:
-                    role2 = "ADMIN"
-                else:
-                    role2 = "INTERN"
-
-                full_name = _clean(row.get("Intern Name") or row.get("Name") or email.split("@")[0])
-                employee_id = _clean(row.get("ID Info") or row.get("Employee ID") or "")
-                department = _clean(row.get("Department") or "")
-
-                password = secrets.token_urlsafe(8)
-
-                if dry:
-                    self.stdout.write(f"[DRY] {email} role={role2}")
-                    continue
-
-                User.objects.create_user(
-                    email=email,
-                    password=password,
-                    full_name=full_name,
-                    role=role2,
-                    employee_id=employee_id,
-                    department=department,
-                    is_verified=True,
-                )
+        def table_row(r):
+            nonlocal created, skipped
+            row = dict(zip(header, r))
+            user = _user_from_row(row)
+            if user is None:
+                return
+            if queue(user):
                 created += 1
-                self.stdout.write(f"{email} | {password} | {employee_id or '-'} | {department or '-'}")
+            else:
+                skipped += 1
+
+        try:
+            # both modes read the same single pass over the file
+            with path.open("r", encoding="utf-8", errors="ignore", newline="") as f:
+                for r in csv.reader(f):
+                    if not r:
+                        continue
+                    rows_read += 1
+
+                    if header is not None:
+                        table_row(r)
+                    elif _is_header(r):
+                        header = [_clean(x) for x in r]
+
+                    first = _clean(r[0])
+                    if not first:
+                        continue
+
+                    # detect role line: "Supervisor ,,,,,,,"
+                    new_role = _role_from_header_cell(first)
+                    if new_role:
+                        flush_block()
+                        role = new_role
+                        block = {}
+                        continue
+
+                    # detect key,value lines: "Name: ,Samip Gajurel"
+                    if len(r) >= 2:
+                        k = _norm_key(r[0])
+                        v = _clean(r[1])
+                        if k in BLOCK_KEYS:
+                            if v:
+                                block[k] = v
+
+            flush_block()
+            flush_pending()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if not dry and created:
+                bump_scopes("users")  # only reaches a shared (file) cache
 
         self.stdout.write(self.style.SUCCESS(f"Done. created={created}, skipped={skipped}"))
         if dry:
             self.stdout.write("DRY RUN: no DB changes were committed.")
+        if opts["stats"]:
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"rows={rows_read} in {elapsed:.2f}s ({rows_read / elapsed if elapsed else 0:.0f} rows/sec), "
+                f"hash+insert {write_seconds:.2f}s"
+            )
@@ -0,0 +1,50 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.import_jobs import claim_next, run_job
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 300
+
+
+class Command(BaseCommand):
+    help = "Run queued CSV import jobs (ImportJob rows) one at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when idle")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **opts):
+        done = failed = errors = 0
+        try:
+            while True:
+                try:
+                    job = claim_next()
+                    if job is not None:
+                        self.stdout.write(f"Import job {job.id}: {job.original_name}{' (dry run)' if job.dry_run else ''}")
+                        if run_job(job):
+                            done += 1
+                        else:
+                            failed += 1
+                    errors = 0
+                except Exception:
+                    # database gone away, deadlock, ...: log and retry with backoff
+                    if not opts["loop"]:
+                        raise
+                    errors += 1
+                    job = None
+                    logger.exception("Import job iteration failed (%d in a row)", errors)
+
+                if job is None:
+                    if not opts["loop"]:
+                        break
+                    time.sleep(min(opts["interval"] * 2 ** errors, MAX_BACKOFF_SECONDS))
+                    close_old_connections()
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"Done. jobs={done}, failed={failed}"))
@@ -0,0 +1,48 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.outbox import OutboxWorker
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 300
+
+
+class Command(BaseCommand):
+    help = "Deliver queued OutboundEmail rows over one reused mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Messages per batch (default EMAIL_OUTBOX_BATCH_SIZE)")
+        parser.add_argument("--max-attempts", type=int, help="Attempts before a message is DEAD")
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when drained")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **opts):
+        worker = OutboxWorker(batch_size=opts["batch_size"], max_attempts=opts["max_attempts"])
+        errors = 0
+        try:
+            while True:
+                try:
+                    worker.drain()
+                    errors = 0
+                except Exception:
+                    # database gone away, deadlock, ...: log and retry with backoff
+                    if not opts["loop"]:
+                        raise
+                    errors += 1
+                    logger.exception("Outbox iteration failed (%d in a row)", errors)
+                finally:
+                    worker.close()
+                if not opts["loop"]:
+                    break
+                time.sleep(min(opts["interval"] * 2 ** errors, MAX_BACKOFF_SECONDS))
+                close_old_connections()
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. sent={worker.sent}, retrying={worker.failed}, dead={worker.dead}"
+        ))
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 
 class UserManager(BaseUserManager):
@@ -39,6 +40,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # bumped on profile changes; part of report/list ETag fingerprints
+    updated_at = models.DateTimeField(auto_now=True)
+    # bumped when role/supervisor/active state changes; tokens carry the value they were issued with
+    token_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -59,3 +64,56 @@ class PasswordResetToken(models.Model):
     token = models.CharField(max_length=200, unique=True)
     used = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+
+class OutboundEmail(models.Model):
+    """Mail queued inside the request's transaction; delivered by `send_outbox`."""
+    STATUS_CHOICES = [("PENDING", "Pending"), ("SENT", "Sent"), ("DEAD", "Dead")]
+
+    to = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True, default="")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_status_next_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.to}: {self.subject} ({self.status})"
+
+class ImportJob(models.Model):
+    """An uploaded user CSV, processed by `run_import_jobs`."""
+    STATUS_CHOICES = [("QUEUED", "Queued"), ("RUNNING", "Running"), ("DONE", "Done"), ("FAILED", "Failed")]
+
+    created_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name="import_jobs")
+    file_path = models.CharField(max_length=500)
+    original_name = models.CharField(max_length=255, blank=True, default="")
+    dry_run = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="QUEUED")
+
+    rows_total = models.PositiveIntegerField(null=True, blank=True)  # known after the first pass
+    rows_processed = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    credentials_sent = models.PositiveIntegerField(default=0)
+    errors_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)  # first IMPORT_JOB_MAX_ERRORS
+    diff = models.JSONField(default=list, blank=True)  # dry runs only, first IMPORT_JOB_MAX_DIFF
+    detail = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)  # heartbeat while RUNNING
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="importjob_status_created_idx"),
+        ]
@@ -0,0 +1,129 @@
+"""
+Transactional email outbox.
+
+Views call enqueue()/enqueue_many() instead of send_mail(), so the message
+row commits (or rolls back) together with the data it is about, and a slow
+or unreachable relay never blocks a request.
+
+`manage.py send_outbox` drains due PENDING rows in batches over one reused
+backend connection. A failed message is retried with exponential backoff
+(EMAIL_OUTBOX_BACKOFF_SECONDS * 2**(attempts-1), capped at an hour); after
+EMAIL_OUTBOX_MAX_ATTEMPTS it is parked as DEAD, keeping recipient, subject
+and last_error for inspection. Bodies of sent and dead messages are
+cleared, since credential mails carry a password; a dead mail is re-issued
+from its view (e.g. a new password reset), not requeued.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF = timedelta(hours=1)
+
+
+def _message(to, subject, body, from_email=None):
+    return OutboundEmail(
+        to=to,
+        subject=subject[:255],
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or "",
+    )
+
+
+def enqueue(to, subject, body, from_email=None):
+    msg = _message(to, subject, body, from_email)
+    msg.save()
+    return msg
+
+
+def enqueue_many(messages, batch_size=500):
+    """messages: iterable of (to, subject, body)."""
+    return OutboundEmail.objects.bulk_create(
+        [_message(*m) for m in messages], batch_size=batch_size
+    )
+
+
+def backoff(attempts):
+    base = timedelta(seconds=getattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 30))
+    return min(base * (2 ** max(attempts - 1, 0)), MAX_BACKOFF)
+
+
+class OutboxWorker:
+    def __init__(self, batch_size=None, max_attempts=None, connection=None):
+        self.batch_size = batch_size or getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 50)
+        self.max_attempts = max_attempts or getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 6)
+        self.connection = connection or get_connection(fail_silently=False)
+        self.sent = 0
+        self.failed = 0
+        self.dead = 0
+
+    def close(self):
+        try:
+            self.connection.close()
+        except Exception:
+            logger.exception("Closing mail connection failed")
+
+    def drain(self):
+        """Send due messages until none are left. Returns messages handled."""
+        handled = 0
+        while True:
+            n = self.run_batch()
+            if not n:
+                return handled
+            handled += n
+
+    @transaction.atomic
+    def run_batch(self):
+        # rows stay locked while we talk to the relay, so parallel workers skip them
+        batch = list(
+            OutboundEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status="PENDING", next_attempt_at__lte=timezone.now())
+            .order_by("next_attempt_at", "id")[: self.batch_size]
+        )
+        if not batch:
+            return 0
+
+        for msg in batch:
+            self._send(msg)
+
+        OutboundEmail.objects.bulk_update(
+            batch, ["status", "attempts", "next_attempt_at", "last_error", "sent_at", "body"]
+        )
+        return len(batch)
+
+    def _send(self, msg):
+        email = EmailMessage(msg.subject, msg.body, msg.from_email or None, [msg.to], connection=self.connection)
+        msg.attempts += 1
+        try:
+            # no-op while the connection is open; one message per call so a
+            # failure is charged to that message only
+            self.connection.open()
+            self.connection.send_messages([email])
+        except Exception as e:
+            logger.warning("Outbox email %s to %s failed (attempt %d): %s", msg.id, msg.to, msg.attempts, e)
+            msg.last_error = f"{type(e).__name__}: {e}"[:2000]
+            if msg.attempts >= self.max_attempts:
+                msg.status = "DEAD"
+                msg.body = ""
+                self.dead += 1
+            else:
+                msg.next_attempt_at = timezone.now() + backoff(msg.attempts)
+                self.failed += 1
+            # the connection may be unusable now; the next message reopens it
+            self.close()
+            return
+
+        msg.status = "SENT"
+        msg.sent_at = timezone.now()
+        msg.last_error = ""
+        msg.body = ""
+        self.sent += 1
+
@@ -6,6 +6,8 @@ from .views import (
     AdminUsersView,
     AdminDeleteUserView,
     AdminImportUsersCSVView,
+    AdminImportJobListView,
+    AdminImportJobView,
 )
 
 urlpatterns = [
@@ -18,4 +20,6 @@ urlpatterns = [
     path("admin/users/", AdminUsersView.as_view()),
     path("admin/delete-user/<int:user_id>/", AdminDeleteUserView.as_view()),
     path("admin/import-users-csv/", AdminImportUsersCSVView.as_view()),
+    path("admin/import-jobs/", AdminImportJobListView.as_view()),
+    path("admin/import-jobs/<int:job_id>/", AdminImportJobView.as_view()),
 ]
@@ -1,9 +1,6 @@
-import csv
 import secrets
-from io import TextIOWrapper
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.db import transaction
 
 from rest_framework.views import APIView
@@ -15,8 +12,16 @@ from rest_framework import status
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
 
-from .models import User, EmailVerificationToken, PasswordResetToken
+from core.cache import bump_scopes
+from core.pagination import KeysetPaginator
+
+from .authentication import full_user, refresh_claims, user_claims
+from .emails import send_verification_email, send_reset_email
+from .import_jobs import create_job, job_payload
+from .importer import CSVImportError
+from .models import ImportJob, User, EmailVerificationToken, PasswordResetToken
 from .serializers import (
     SignupSerializer, VerifyEmailSerializer, UserMeSerializer,
     ForgotPasswordSerializer, ResetPasswordSerializer
@@ -28,49 +33,19 @@ from .tokens import new_token
 WEBMAIL_URL = "https://webmail.migadu.com/"
 
 
-# -------------------- EMAIL HELPERS --------------------
-def send_verification_email(user: User):
-    token = new_token(16)
-    EmailVerificationToken.objects.create(user=user, token=token)
-
-    verify_url = f"{settings.FRONTEND_BASE_URL}/verify.html?token={token}"
-    subject = "Verify your Codavatar InternTrack account"
-    message = f"Hello {user.full_name},\n\nPlease verify your account:\n{verify_url}\n\n- Codavatar Tech"
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
-
-
-def send_reset_email(user: User, token: str):
-    reset_url = f"{settings.FRONTEND_BASE_URL}/reset_password.html?token={token}"
-    subject = "Reset your Codavatar InternTrack password"
-    message = f"Hello {user.full_name},\n\nReset your password using this link:\n{reset_url}\n\n- Codavatar Tech"
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
-
-
-def send_credentials_email(user: User, password: str):
-    subject = "Your Codavatar InternTrack Login Credentials"
-    message = (
-        f"Hello {user.full_name},\n\n"
-        f"Your account has been created by Codavatar Tech.\n"
-        f"Email: {user.email}\n"
-        f"Password: {password}\n\n"
-        f"Login: {settings.FRONTEND_BASE_URL}/login.html\n\n"
-        f"- Codavatar Tech"
-    )
-    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
-
-
 # -------------------- ME --------------------
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        return Response(UserMeSerializer(request.user).data)
+        return Response(UserMeSerializer(full_user(request.user)).data)
 
 
 # -------------------- SIGNUP (SELF-SIGNUP = NOT VERIFIED) --------------------
 class SignupView(APIView):
     permission_classes = []
 
+    @transaction.atomic  # the outbox row commits with the user/token
     def post(self, request):
         ser = SignupSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -91,6 +66,7 @@ class SignupView(APIView):
             role=role,
             is_verified=False,
         )
+        bump_scopes("users")
 
         # You can still send a verification email for email ownership
         # but DO NOT set is_verified=True from email verify if admin approval is required.
@@ -133,6 +109,14 @@ class VerifyEmailView(APIView):
 
 # -------------------- VERIFIED-ONLY JWT (WITH MIGADU REDIRECT INFO) --------------------
 class VerifiedTokenSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # role/scope claims let ClaimsJWTAuthentication skip the User lookup
+        token = super().get_token(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
         user = self.user
@@ -156,6 +140,7 @@ class VerifiedTokenObtainPairView(TokenObtainPairView):
 class ForgotPasswordView(APIView):
     permission_classes = []
 
+    @transaction.atomic  # the outbox row commits with the user/token
     def post(self, request):
         ser = ForgotPasswordSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -203,13 +188,21 @@ class AdminUsersView(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        interns = User.objects.filter(role="INTERN").order_by("full_name")
-        supervisors = User.objects.filter(role="SUPERVISOR").order_by("full_name")
+        # each list pages independently (?interns_cursor= / ?supervisors_cursor=);
+        # ?role=INTERN|SUPERVISOR limits the response to one list
+        role = (request.query_params.get("role") or "").upper()
+        data = {"interns": [], "supervisors": [], "next": {"interns": None, "supervisors": None}}
 
-        return Response({
-            "interns": UserMeSerializer(interns, many=True).data,
-            "supervisors": UserMeSerializer(supervisors, many=True).data,
-        })
+        for key, value in [("interns", "INTERN"), ("supervisors", "SUPERVISOR")]:
+            if role and role != value:
+                continue
+            page = KeysetPaginator(request, ordering=("full_name", "id"), prefix=f"{key}_", full=True)
+            users = page.paginate(User.objects.filter(role=value))
+            data[key] = UserMeSerializer(users, many=True).data
+            if page.next_url:
+                data["next"][key] = replace_query_param(page.next_url, "role", value)
+
+        return Response(data)
 
 
 class AdminDeleteUserView(APIView):
@@ -220,6 +213,8 @@ class AdminDeleteUserView(APIView):
             return Response({"detail": "You cannot delete yourself"}, status=400)
 
         User.objects.filter(id=user_id).delete()
+        bump_scopes("users")
+        refresh_claims(user_id)
         return Response({"detail": "User deleted"})
 
 
@@ -229,167 +224,45 @@ class AdminImportUsersCSVView(APIView):
     Admin uploads company CSV -> create/update users -> auto-verified users.
     CSV columns supported (case-insensitive):
       email, full_name, role, employee_id, department, supervisor_email
+
+    The file is saved and queued as an ImportJob (run by `manage.py run_import_jobs`);
+    poll the Location for progress. dry_run=1 only reports what would change.
     """
     permission_classes = [IsAdmin]
     parser_classes = [MultiPartParser, FormParser]
 
-    @transaction.atomic
     def post(self, request):
         f = request.FILES.get("file")
         if not f:
             return Response({"detail": "CSV file is required. Use form-data field name: file"}, status=400)
 
-        # Read CSV
-        reader = csv.DictReader(TextIOWrapper(f.file, encoding="utf-8", newline=""))
-        if not reader.fieldnames:
-            return Response({"detail": "CSV has no header."}, status=400)
-
-        # Normalize headers to lowercase
-        headers = [h.strip().lower() for h in reader.fieldnames]
-
-        required = ["email", "full_name", "role"]
-        for r in required:
-            if r not in headers:
-                return Response({"detail": f"CSV missing required column: {r}"}, status=400)
-
-        created = 0
-        updated = 0
-        errors = []
-        credentials_sent = 0
-
-        # First pass: create supervisors first
-        rows = list(reader)
-
-        def get_val(row, key):
-            # handle case-insensitive keys
-            for k in row.keys():
-                if k and k.strip().lower() == key:
-                    return (row.get(k) or "").strip()
-            return ""
-
-        # Create supervisors first
-        for row in rows:
-            role = get_val(row, "role").upper()
-            if role != "SUPERVISOR":
-                continue
-
-            email = get_val(row, "email").lower()
-            full_name = get_val(row, "full_name")
-            employee_id = get_val(row, "employee_id")
-            department = get_val(row, "department")
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true", "yes")
+        try:
+            job = create_job(f, request.user.id, dry_run=dry_run)
+        except CSVImportError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        data = job_payload(job)
+        data["detail"] = "CSV import queued."
+        return Response(
+            data, status=202,
+            headers={"Location": f"/api/accounts/admin/import-jobs/{job.id}/"},
+        )
 
-            if not email or not full_name:
-                errors.append({"email": email, "error": "Missing email/full_name"})
-                continue
 
-            user, was_created = User.objects.get_or_create(
-                email=email,
-                defaults={
-                    "full_name": full_name,
-                    "role": "SUPERVISOR",
-                    "employee_id": employee_id,
-                    "department": department,
-                    "is_verified": True,  # ✅ company/admin data => auto-verified
-                }
-            )
-
-            if was_created:
-                pwd = new_token(10)
-                user.set_password(pwd)
-                user.save()
-                created += 1
-                send_credentials_email(user, pwd)
-                credentials_sent += 1
-            else:
-                # update and ensure verified
-                changed = False
-                if user.full_name != full_name:
-                    user.full_name = full_name
-                    changed = True
-                if user.role != "SUPERVISOR":
-                    user.role = "SUPERVISOR"
-                    changed = True
-                if employee_id and user.employee_id != employee_id:
-                    user.employee_id = employee_id
-                    changed = True
-                if department and user.department != department:
-                    user.department = department
-                    changed = True
-                if not user.is_verified:
-                    user.is_verified = True
-                    changed = True
-                if changed:
-                    user.save()
-                    updated += 1
-
-        # Second pass: create interns and attach supervisor
-        for row in rows:
-            role = get_val(row, "role").upper()
-            if role != "INTERN":
-                continue
+class AdminImportJobListView(APIView):
+    permission_classes = [IsAdmin]
 
-            email = get_val(row, "email").lower()
-            full_name = get_val(row, "full_name")
-            employee_id = get_val(row, "employee_id")
-            department = get_val(row, "department")
-            supervisor_email = get_val(row, "supervisor_email").lower()
+    def get(self, request):
+        jobs = ImportJob.objects.defer("errors", "diff").order_by("-created_at", "-id")[:20]
+        return Response([job_payload(j, full=False) for j in jobs])
 
-            if not email or not full_name:
-                errors.append({"email": email, "error": "Missing email/full_name"})
-                continue
 
-            supervisor = None
-            if supervisor_email:
-                supervisor = User.objects.filter(email=supervisor_email, role="SUPERVISOR").first()
-
-            user, was_created = User.objects.get_or_create(
-                email=email,
-                defaults={
-                    "full_name": full_name,
-                    "role": "INTERN",
-                    "employee_id": employee_id,
-                    "department": department,
-                    "supervisor": supervisor,
-                    "is_verified": True,  # ✅ company/admin data => auto-verified
-                }
-            )
-
-            if was_created:
-                pwd = new_token(10)
-                user.set_password(pwd)
-                user.save()
-                created += 1
-                send_credentials_email(user, pwd)
-                credentials_sent += 1
-            else:
-                changed = False
-                if user.full_name != full_name:
-                    user.full_name = full_name
-                    changed = True
-                if user.role != "INTERN":
-                    user.role = "INTERN"
-                    changed = True
-                if employee_id and user.employee_id != employee_id:
-                    user.employee_id = employee_id
-                    changed = True
-                if department and user.department != department:
-                    user.department = department
-                    changed = True
-                if supervisor and user.supervisor_id != supervisor.id:
-                    user.supervisor = supervisor
-                    changed = True
-                if not user.is_verified:
-                    user.is_verified = True
-                    changed = True
-                if changed:
-                    user.save()
-                    updated += 1
+class AdminImportJobView(APIView):
+    permission_classes = [IsAdmin]
 
-        return Response({
-            "detail": "CSV import completed.",
-            "created": created,
-            "updated": updated,
-            "credentials_sent": credentials_sent,
-            "errors_count": len(errors),
-            "errors": errors[:50],
-        }, status=200)
+    def get(self, request, job_id):
+        job = ImportJob.objects.filter(id=job_id).first()
+        if not job:
+            return Response({"detail": "Import job not found."}, status=404)
+        return Response(job_payload(job))
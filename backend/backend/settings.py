@@ -106,12 +106,41 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# Rendered monthly report artifacts (PDF/CSV), LRU-capped
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", str(BASE_DIR / "report_cache"))
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+# CACHE_BACKEND=file (default, shared by workers on one host) or locmem (per process,
+# single-worker dev only: the response cache switches itself off on locmem)
+if os.getenv("CACHE_BACKEND", "file") == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", str(BASE_DIR / "cache")),
+            "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "5000"))},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "backup-default",
+            "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "5000"))},
+        }
+    }
+
+# per-user GET response cache (core/cache.py); entries are also invalidated on write
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
 CORS_ALLOWED_ORIGINS = [
     o.strip()
     for o in os.getenv("CORS_ALLOWED_ORIGINS", "").split(",")
     if o.strip()
 ]
 
+# keyset pagination on list endpoints; next page is sent in a Link header
+CORS_EXPOSE_HEADERS = ["Link"]
+
 CSRF_TRUSTED_ORIGINS = [
     o.strip()
     for o in os.getenv("CSRF_TRUSTED_ORIGINS", "").split(",")
@@ -122,20 +151,68 @@ AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
+KEYSET_PAGE_SIZE = int(os.getenv("KEYSET_PAGE_SIZE", "100"))
+KEYSET_MAX_PAGE_SIZE = int(os.getenv("KEYSET_MAX_PAGE_SIZE", "500"))
+
+# Buffered ActivityLog writer (internships/activity.py)
+ACTIVITY_LOG_SYNC = os.getenv("ACTIVITY_LOG_SYNC", "0") == "1"
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "200"))
+ACTIVITY_LOG_FLUSH_SECONDS = float(os.getenv("ACTIVITY_LOG_FLUSH_SECONDS", "2"))
+ACTIVITY_LOG_MAX_QUEUE = int(os.getenv("ACTIVITY_LOG_MAX_QUEUE", "10000"))
+
+# archive_activity_logs / read_activity_archive
+ACTIVITY_RETENTION_DAYS = int(os.getenv("ACTIVITY_RETENTION_DAYS", "180"))
+ACTIVITY_ARCHIVE_DIR = os.getenv("ACTIVITY_ARCHIVE_DIR", str(BASE_DIR / "activity_archive"))
+
+# attendance geofence (internships/geofence.py); the OFFICE_* site is only used
+# while no OfficeLocation rows are active
+OFFICE_LAT = float(os.getenv("OFFICE_LAT", "0") or 0)
+OFFICE_LNG = float(os.getenv("OFFICE_LNG", "0") or 0)
+OFFICE_RADIUS_M = float(os.getenv("OFFICE_RADIUS_M", "150") or 150)
+GEOFENCE_CELL_DEG = float(os.getenv("GEOFENCE_CELL_DEG", "0.01"))
+GEOFENCE_REFRESH_SECONDS = float(os.getenv("GEOFENCE_REFRESH_SECONDS", "60"))
+# revalidate_attendance: faster than this between two fixes over more than
+# ATTENDANCE_TRAVEL_MIN_M is flagged as impossible travel
+ATTENDANCE_MAX_SPEED_KMH = float(os.getenv("ATTENDANCE_MAX_SPEED_KMH", "900"))
+ATTENDANCE_TRAVEL_MIN_M = float(os.getenv("ATTENDANCE_TRAVEL_MIN_M", "2000"))
+# intern/attendance/batch/: items per request, and how old a queued check-in may be
+ATTENDANCE_BATCH_MAX_ITEMS = int(os.getenv("ATTENDANCE_BATCH_MAX_ITEMS", "100"))
+ATTENDANCE_BATCH_MAX_AGE_DAYS = int(os.getenv("ATTENDANCE_BATCH_MAX_AGE_DAYS", "7"))
+# presence board (internships/presence.py): seconds a cached day lives before it is reloaded from the DB
+PRESENCE_REBUILD_SECONDS = int(os.getenv("PRESENCE_REBUILD_SECONDS", "60"))
+# attendance rates (internships/attendance_calendar.py): weekday numbers, Monday=0;
+# Saturday is the weekly holiday here. Public holidays are Holiday rows.
+ATTENDANCE_WEEKEND_DAYS = os.getenv("ATTENDANCE_WEEKEND_DAYS", "5")
+
+# process pool for PBKDF2 hashing during bulk imports (accounts/hashing.py); 0 = all usable cores
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
+
+# full User row behind a claims-only request.user (accounts/authentication.py); 0 = no cache
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+
+# current token_version/role/active state per user (accounts/authentication.py); misses read the DB
+AUTH_CLAIMS_CACHE_TTL = int(os.getenv("AUTH_CLAIMS_CACHE_TTL", "60"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# locmem/filebased backends work too (EMAIL_FILE_PATH), e.g. to exercise send_outbox locally
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_FILE_PATH = os.getenv("EMAIL_FILE_PATH", str(BASE_DIR / "sent_emails"))
 EMAIL_HOST = os.getenv("EMAIL_HOST")
 EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
 EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "1") == "1"
@@ -143,4 +220,19 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER)
 
+# accounts/outbox.py, drained by `manage.py send_outbox`
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "6"))
+EMAIL_OUTBOX_BACKOFF_SECONDS = int(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "30"))
+
+# CSV imports (accounts/import_jobs.py), run by `manage.py run_import_jobs`
+IMPORT_UPLOAD_DIR = os.getenv("IMPORT_UPLOAD_DIR", str(BASE_DIR / "import_uploads"))
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_JOB_MAX_ERRORS = int(os.getenv("IMPORT_JOB_MAX_ERRORS", "200"))
+IMPORT_JOB_MAX_DIFF = int(os.getenv("IMPORT_JOB_MAX_DIFF", "500"))
+IMPORT_JOB_STALE_SECONDS = int(os.getenv("IMPORT_JOB_STALE_SECONDS", "600"))
+
+# attendance re-validation jobs (internships/revalidation_jobs.py, `manage.py run_revalidation_jobs`)
+REVALIDATION_JOB_STALE_SECONDS = int(os.getenv("REVALIDATION_JOB_STALE_SECONDS", "600"))
+
 # FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL", "http://127.0.0.1:5500")
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Per-user response cache for read-heavy APIView GETs.
+
+    class InternMyTasks(APIView):
+        @cached_response("tasks:intern:{user}", "users")
+        def get(self, request): ...
+
+A cached entry is keyed by (view, user, query string, current versions of
+its scopes). Write paths call bump_scopes("tasks:intern:17", ...) which
+moves those versions forward, so every dependent entry is skipped without
+having to find and delete it; stale entries simply age out (TTL).
+
+Version stamps start from a time-based value, so a stamp that gets evicted
+comes back as a fresh value instead of re-validating old entries.
+
+Invalidation is only as wide as the cache backend: on a per-process
+LocMemCache a bump reaches one worker while the others keep serving the old
+entry for up to RESPONSE_CACHE_TTL. The decorator therefore passes straight
+through to the view unless the default cache is shared (file, redis, ...).
+
+Hit/miss counters are kept per view in this process (a hit only reads the
+cache; with the file backend every write is a file plus a directory scan for
+culling) and reported, with the pid, by cache_stats().
+"""
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+KEY_PREFIX = "respcache"
+CACHED_HEADERS = ("ETag", "Link", "Cache-Control", "Vary")
+
+_views = set()
+_stats = Counter()  # (view, "hit" | "miss") -> count, this process only
+_stats_lock = threading.Lock()
+
+
+def _version_key(scope):
+    return f"{KEY_PREFIX}:v:{scope}"
+
+
+def _versions(scopes):
+    keys = [_version_key(s) for s in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [str(found[k]) for k in keys]
+
+
+def bump_scopes(*scopes):
+    """Invalidate every cached response that depends on any of `scopes` (after commit)."""
+    def _bump():
+        for scope in scopes:
+            key = _version_key(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+    transaction.on_commit(_bump)
+
+
+def enabled():
+    """False on a per-process cache, where bump_scopes cannot reach other workers."""
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def _count(view, outcome):
+    with _stats_lock:
+        _stats[(view, outcome)] += 1
+
+
+def cached_response(*scopes, ttl=None):
+    """
+    Decorate an APIView.get. Scope templates may use {user} (request.user.id).
+    Only 200 responses are stored.
+    """
+    def decorator(method):
+        view = method.__qualname__.split(".")[0]
+        _views.add(view)
+
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if not enabled():
+                return method(self, request, *args, **kwargs)
+
+            user_id = request.user.id
+            resolved = [s.format(user=user_id) for s in scopes]
+            query = hashlib.sha1(request.META.get("QUERY_STRING", "").encode()).hexdigest()[:16]
+            key = ":".join([KEY_PREFIX, view, str(user_id), query, *_versions(resolved)])
+
+            hit = cache.get(key)
+            if hit is not None:
+                _count(view, "hit")
+                data, status, headers = hit
+                etag = headers.get("ETag")
+                if etag and etag in parse_etags(request.headers.get("If-None-Match", "")):
+                    return Response(status=304, headers=headers)
+                return Response(data, status=status, headers=headers)
+
+            _count(view, "miss")
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                headers = {h: response[h] for h in CACHED_HEADERS if response.has_header(h)}
+                timeout = ttl if ttl is not None else settings.RESPONSE_CACHE_TTL
+                cache.set(key, (response.data, response.status_code, headers), timeout)
+            return response
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """Hit/miss counts per view since this worker started."""
+    with _stats_lock:
+        counts = dict(_stats)
+
+    out = {}
+    for v in sorted(_views):
+        hits = counts.get((v, "hit"), 0)
+        misses = counts.get((v, "miss"), 0)
+        total = hits + misses
+        out[v] = {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 3) if total else None}
+    return {"pid": os.getpid(), "enabled": enabled(), "views": out}
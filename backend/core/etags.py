@@ -0,0 +1,56 @@
+"""
+Strong ETags for per-user list endpoints, computed from one aggregate
+(count, max updated_at, max id) over the user's rows instead of the
+serialized body.
+
+    etag = list_etag(request, qs)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    ...
+    return with_etag(response, etag)
+
+Anything that changes a row must bump its updated_at (include "updated_at"
+in update_fields), otherwise clients keep getting 304s. Lists that render
+fields of joined rows (e.g. the intern's name on a task) name those
+relations in `related`; their max updated_at is folded into the same
+aggregate, so renaming a user changes the ETag of every list showing them.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.response import Response
+
+
+def list_etag(request, qs, updated_field="updated_at", related=()):
+    joined = {f"rel_{name}": Max(f"{name}__updated_at") for name in related}
+    agg = qs.order_by().aggregate(n=Count("id"), last=Max(updated_field), max_id=Max("id"), **joined)
+    raw = "|".join([
+        str(request.user.id),
+        request.get_full_path(),  # page/cursor params select a different body
+        str(agg["n"]),
+        agg["last"].isoformat() if agg["last"] else "",
+        str(agg["max_id"] or 0),
+        *(agg[key].isoformat() if agg[key] else "" for key in joined),
+    ])
+    return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+
+
+def etag_matches(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag in etags
+
+
+def with_etag(response, etag):
+    response["ETag"] = etag
+    # let the browser store it but revalidate on every navigation
+    response["Cache-Control"] = "private, no-cache"
+    response["Vary"] = "Authorization"
+    return response
+
+
+def not_modified(etag):
+    return with_etag(Response(status=304), etag)
@@ -0,0 +1,119 @@
+"""
+Keyset ("seek") pagination for hand-written APIView lists.
+
+Pages are addressed by an opaque cursor holding the ordering values of the
+last row served, so page N costs the same index range scan as page 1.
+The response body keeps whatever shape the view already returns; the next
+page is advertised in a `Link: <url>; rel="next"` header.
+
+Without ?cursor= a list returns its first page: page_size, else the view's
+default_size (the row cap the list always had), else KEYSET_PAGE_SIZE.
+Small per-user lists whose screens need every row (my interns, my tasks,
+the admin user list) pass full=True and only page once ?cursor= or
+?page_size= is given.
+
+    page = KeysetPaginator(request)
+    rows = page.paginate(qs)  # qs filtered, not yet ordered
+    return page.response([...rows...])
+"""
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPaginator:
+    def __init__(self, request, ordering=("-created_at", "-id"), prefix="", default_size=None, full=False):
+        self.request = request
+        self.ordering = ordering
+        self.cursor_param = f"{prefix}cursor"
+        self.size_param = f"{prefix}page_size" if prefix else "page_size"
+        params = request.query_params
+        self.enabled = not full or self.cursor_param in params or self.size_param in params
+        self.default_size = default_size
+        self.page_size = self._page_size()
+        self.next_url = None
+
+    def _page_size(self):
+        default = self.default_size or getattr(settings, "KEYSET_PAGE_SIZE", 100)
+        maximum = getattr(settings, "KEYSET_MAX_PAGE_SIZE", 500)
+        raw = self.request.query_params.get(self.size_param)
+        if not raw:
+            return default
+        try:
+            size = int(raw)
+        except ValueError:
+            raise ParseError(f"{self.size_param} must be an integer")
+        return max(1, min(size, maximum))
+
+    def paginate(self, qs):
+        """Order qs, apply the cursor and return at most page_size rows."""
+        if not self.enabled:
+            return list(qs.order_by(*self.ordering))
+
+        model = qs.model
+        fields = [f.lstrip("-") for f in self.ordering]
+
+        cursor = self.request.query_params.get(self.cursor_param)
+        if cursor:
+            values = self._decode(cursor, model, fields)
+            qs = qs.filter(self._after(values))
+
+        rows = list(qs.order_by(*self.ordering)[: self.page_size + 1])
+        if len(rows) > self.page_size:
+            rows = rows[: self.page_size]
+            self.next_url = replace_query_param(
+                self.request.build_absolute_uri(),
+                self.cursor_param,
+                self._encode(rows[-1], fields),
+            )
+        return rows
+
+    def link_header(self):
+        return f'<{self.next_url}>; rel="next"' if self.next_url else None
+
+    def response(self, data, **kwargs):
+        resp = Response(data, **kwargs)
+        if self.next_url:
+            resp["Link"] = self.link_header()
+        return resp
+
+    def _after(self, values):
+        # (a, b) after (va, vb) in ORDER BY a DESC, b DESC:
+        #   a < va  OR  (a = va AND b < vb)
+        q = Q()
+        equal = {}
+        for name, value in zip(self.ordering, values):
+            field = name.lstrip("-")
+            op = "lt" if name.startswith("-") else "gt"
+            q |= Q(**equal, **{f"{field}__{op}": value})
+            equal[field] = value
+        return q
+
+    @staticmethod
+    def _value(row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    def _encode(self, row, fields):
+        values = []
+        for field in fields:
+            v = self._value(row, field)
+            values.append(v.isoformat() if hasattr(v, "isoformat") else v)
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode(cursor, model, fields):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [model._meta.get_field(f).to_python(v) for f, v in zip(fields, values)]
+        except (ValueError, TypeError, ValidationError):
+            raise ParseError("Invalid cursor")
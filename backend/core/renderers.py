@@ -0,0 +1,55 @@
+"""
+JSON renderer backed by orjson, with a stdlib fallback.
+
+Views can put datetime/date/Decimal/UUID values straight into response data;
+they are encoded natively instead of being .isoformat()'d per row in Python.
+Datetimes come out as datetime.isoformat() (aware UTC values end in +00:00),
+the format the hand-built list endpoints already sent.
+
+Output matches rest_framework.renderers.JSONRenderer (compact, UTF-8,
+U+2028/U+2029 escaped), except that NaN/Infinity become null. Requests for
+indented output (browsable API, `; indent=N`) and installs without orjson use
+the stdlib path with the same encoding rules.
+"""
+import datetime
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class PlainDatetimeEncoder(JSONEncoder):
+    """DRF's encoder, but datetimes keep their isoformat() offset (no Z)."""
+
+    def default(self, obj):
+        if isinstance(obj, datetime.datetime):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+_fallback = PlainDatetimeEncoder().default
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    encoder_class = PlainDatetimeEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_fallback, option=ORJSON_OPTIONS)
+        # keep the output a strict JavaScript subset, like JSONRenderer
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,256 @@
+"""
+Buffered ActivityLog writer.
+
+Views call log_activity(actor, verb, target, payload) instead of
+ActivityLog.objects.create; the display text is rendered from ACTION_TEXT.
+Entries are queued in-process and written with one bulk_create when the
+request finishes (after the response is sent), so a request's log rows cost
+one INSERT and are visible as soon as it is done. Writes outside requests
+(management commands, threads) are flushed when the queue reaches
+ACTIVITY_LOG_BATCH_SIZE or its oldest entry is older than
+ACTIVITY_LOG_FLUSH_SECONDS, by a small background thread. Anything left is
+flushed at interpreter exit.
+
+A batch the database rejects (IntegrityError, DataError, ...) is retried
+row by row and only the rows that still fail are dropped, so one bad entry
+cannot hold back the rest. Only OperationalError (database unreachable,
+locked, ...) puts the batch back on the queue for the next flush.
+
+ACTIVITY_LOG_SYNC = True writes each entry immediately (tests, scripts).
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, OperationalError, close_old_connections
+from django.utils import timezone
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogWriter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = []
+        self._oldest = None
+        self._thread = None
+        self.queued = 0
+        self.flushed = 0
+        self.dropped = 0
+
+    # ---------- settings (read per call so override_settings works) ----------
+    @property
+    def sync(self):
+        return getattr(settings, "ACTIVITY_LOG_SYNC", False)
+
+    @property
+    def batch_size(self):
+        return getattr(settings, "ACTIVITY_LOG_BATCH_SIZE", 200)
+
+    @property
+    def flush_seconds(self):
+        return getattr(settings, "ACTIVITY_LOG_FLUSH_SECONDS", 2.0)
+
+    @property
+    def max_queue(self):
+        return getattr(settings, "ACTIVITY_LOG_MAX_QUEUE", 10000)
+
+    # ---------- API ----------
+    def log(self, entry):
+        if self.sync:
+            entry.save()
+            with self._lock:
+                self.queued += 1
+                self.flushed += 1
+            return
+
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                return
+            self._queue.append(entry)
+            self.queued += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._queue) >= self.batch_size
+
+        self._ensure_thread()
+        if full:
+            self.flush()
+
+    def log_many(self, entries):
+        """Queue several entries under one lock (one bulk_create when sync)."""
+        entries = list(entries)
+        if not entries:
+            return
+        if self.sync:
+            ActivityLog.objects.bulk_create(entries)
+            with self._lock:
+                self.queued += len(entries)
+                self.flushed += len(entries)
+            return
+
+        with self._lock:
+            room = max(self.max_queue - len(self._queue), 0)
+            self.dropped += max(len(entries) - room, 0)
+            entries = entries[:room]
+            if not entries:
+                return
+            self._queue.extend(entries)
+            self.queued += len(entries)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._queue) >= self.batch_size
+
+        self._ensure_thread()
+        if full:
+            self.flush()
+
+    def due(self):
+        with self._lock:
+            if not self._queue:
+                return False
+            return (
+                len(self._queue) >= self.batch_size
+                or time.monotonic() - self._oldest >= self.flush_seconds
+            )
+
+    def flush_if_due(self):
+        if self.due():
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            batch, self._queue, self._oldest = self._queue, [], None
+        if not batch:
+            return 0
+
+        try:
+            ActivityLog.objects.bulk_create(batch, batch_size=self.batch_size)
+        except OperationalError:
+            logger.exception("Activity log flush failed (%d entries), requeued", len(batch))
+            self._requeue(batch)
+            return 0
+        except DatabaseError:
+            logger.exception("Activity log batch rejected (%d entries), retrying row by row", len(batch))
+            return self._flush_rows(batch)
+
+        with self._lock:
+            self.flushed += len(batch)
+        return len(batch)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "mode": "sync" if self.sync else "buffered",
+                "queued": self.queued,
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "pending": len(self._queue),
+            }
+
+    # ---------- internals ----------
+    def _flush_rows(self, batch):
+        written = dropped = 0
+        for n, entry in enumerate(batch):
+            try:
+                ActivityLog.objects.bulk_create([entry])
+            except OperationalError:
+                logger.exception("Activity log flush failed, requeued %d entries", len(batch) - n)
+                self._requeue(batch[n:])
+                break
+            except DatabaseError:
+                logger.exception("Dropping activity log entry %s/%s", entry.verb, entry.target_id)
+                dropped += 1
+            else:
+                written += 1
+
+        with self._lock:
+            self.flushed += written
+            self.dropped += dropped
+        return written
+
+    def _requeue(self, batch):
+        with self._lock:
+            room = max(self.max_queue - len(self._queue), 0)
+            self.dropped += max(len(batch) - room, 0)
+            self._queue[:0] = batch[:room]
+            if self._queue and self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="activity-log-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            if self.due():
+                close_old_connections()
+                self.flush()
+
+    def _after_fork(self):
+        # the lock may have been held by another thread at fork time, and the
+        # flusher thread does not exist in the child
+        self._lock = threading.Lock()
+        self._queue = []
+        self._oldest = None
+        self._thread = None
+
+
+writer = ActivityLogWriter()
+os.register_at_fork(after_in_child=writer._after_fork)
+atexit.register(writer.flush)
+
+
+Verb = ActivityLog.Verb
+
+ACTION_TEXT = {
+    Verb.TASK_CREATE: "Created task {target_id} for {intern}",
+    Verb.TASK_STATUS: "Updated task {target_id} -> {status}",
+    Verb.TASK_RATE: "Rated task {target_id} ({stars} stars)",
+    Verb.REPORT_SUBMIT: "Submitted report for task {target_id}",
+    Verb.ATTENDANCE_MARK: "Marked attendance (in_office={in_office}, validated={validated})",
+    Verb.COMPLAINT_CREATE: "Created complaint {target_id}",
+    Verb.COMPLAINT_STATUS: "Updated complaint {target_id} -> {status}",
+    Verb.INTERN_ASSIGN: "Assigned {intern} -> {supervisor}",
+    Verb.INTERN_UNASSIGN: "Unassigned {intern}",
+}
+
+
+def build_entry(actor, verb, target=None, payload=None):
+    payload = payload or {}
+    target_id = getattr(target, "pk", None)
+    return ActivityLog(
+        actor_id=getattr(actor, "id", actor),
+        verb=verb,
+        target_type=target._meta.model_name if target is not None else "",
+        target_id=target_id,
+        payload=payload,
+        action=ACTION_TEXT.get(verb, "{verb}").format(verb=verb, target_id=target_id, **payload)[:500],
+        created_at=timezone.now(),
+    )
+
+
+def log_activity(actor, verb, target=None, payload=None):
+    writer.log(build_entry(actor, verb, target, payload))
+
+
+def log_activities(actor, verb, items):
+    """items: iterable of (target, payload); queued together."""
+    writer.log_many(build_entry(actor, verb, target, payload) for target, payload in items)
+
+
+def flush_on_request_finished(sender, **kwargs):
+    writer.flush()
@@ -1,8 +1,26 @@
 from django.contrib import admin
-from .models import Task, TaskReport, Attendance, Complaint, ActivityLog
+from .models import Task, TaskReport, Attendance, Complaint, ActivityLog, OfficeLocation, Holiday
 
 admin.site.register(Task)
 admin.site.register(TaskReport)
-admin.site.register(Attendance)
+
+
+@admin.register(Attendance)
+class AttendanceAdmin(admin.ModelAdmin):
+    # check-ins are written by the API, which also keeps the attendance
+    # calendar bits, presence and rollups in step; here they can only be
+    # viewed or deleted (deletes refresh those via post_delete)
+    list_display = ("intern", "work_date", "in_office", "location_validated", "impossible_travel", "created_at")
+    list_filter = ("work_date", "location_validated", "impossible_travel")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 admin.site.register(Complaint)
 admin.site.register(ActivityLog)
+admin.site.register(OfficeLocation)
+admin.site.register(Holiday)
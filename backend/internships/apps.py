@@ -2,4 +2,19 @@ from django.apps import AppConfig
 
 class InternshipsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "internships"
\ No newline at end of file
+    name = "internships"
+
+    def ready(self):
+        from django.core.signals import request_finished
+        from django.db.models.signals import post_delete, post_save
+        from .activity import flush_on_request_finished
+        from .attendance_calendar import on_attendance_deleted as refresh_calendar
+        from .geofence import on_office_changed
+        from .models import Attendance, OfficeLocation
+        from .presence import on_attendance_deleted
+
+        request_finished.connect(flush_on_request_finished, dispatch_uid="activity_log_flush")
+        post_save.connect(on_office_changed, sender=OfficeLocation, dispatch_uid="geofence_office_saved")
+        post_delete.connect(on_office_changed, sender=OfficeLocation, dispatch_uid="geofence_office_deleted")
+        post_delete.connect(on_attendance_deleted, sender=Attendance, dispatch_uid="presence_attendance_deleted")
+        post_delete.connect(refresh_calendar, sender=Attendance, dispatch_uid="calendar_attendance_deleted")
\ No newline at end of file
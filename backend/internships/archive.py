@@ -0,0 +1,148 @@
+"""
+Cold archive for old ActivityLog rows.
+
+Rows are moved in id-ordered chunks: each chunk is written to gzip'd JSON
+Lines files partitioned by local date,
+
+    <ACTIVITY_ARCHIVE_DIR>/YYYY/MM/DD/part-<first id>-<last id>.jsonl.gz
+
+recorded in manifest.jsonl (one line per part: rows, sha256, id range) and
+only then deleted, one short transaction per chunk. If a run dies between
+writing and deleting a chunk, the next run writes the same rows under the
+same part name, and readers keep the last manifest line per part.
+"""
+import gzip
+import hashlib
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ActivityLog
+from .utils import local_tz
+
+FIELDS = ["id", "actor_id", "verb", "target_type", "target_id", "payload", "action", "created_at"]
+MANIFEST = "manifest.jsonl"
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def archive_dir(path=None) -> Path:
+    return Path(path or settings.ACTIVITY_ARCHIVE_DIR)
+
+
+def archive_before(cutoff, chunk_size=5000, path=None, dry_run=False):
+    """Move rows with created_at < cutoff into the archive. Yields per-chunk stats."""
+    root = archive_dir(path)
+    last_id = 0
+
+    while True:
+        rows = list(
+            ActivityLog.objects
+            .filter(created_at__lt=cutoff, id__gt=last_id)
+            .order_by("id")
+            .values(*FIELDS)[:chunk_size]
+        )
+        if not rows:
+            return
+        last_id = rows[-1]["id"]
+
+        by_day = defaultdict(list)
+        for row in rows:
+            by_day[timezone.localtime(row["created_at"], local_tz()).date()].append(row)
+
+        if not dry_run:
+            root.mkdir(parents=True, exist_ok=True)
+            entries = [_write_part(root, day, day_rows) for day, day_rows in sorted(by_day.items())]
+            _append_manifest(root, entries)
+
+            with transaction.atomic():
+                ActivityLog.objects.filter(id__in=[r["id"] for r in rows]).delete()
+
+        yield {"rows": len(rows), "days": len(by_day), "first_id": rows[0]["id"], "last_id": last_id}
+
+
+def _write_part(root, day, rows):
+    rel = Path(f"{day:%Y/%m/%d}") / f"part-{rows[0]['id']}-{rows[-1]['id']}.jsonl.gz"
+    target = root / rel
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "wb") as raw:
+        # mtime=0 keeps the bytes (and checksum) stable across re-runs
+        with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+            for row in rows:
+                row = dict(row, created_at=row["created_at"].isoformat())
+                gz.write(json.dumps(row, separators=(",", ":")).encode() + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, target)
+
+    return {
+        "path": rel.as_posix(),
+        "date": day.isoformat(),
+        "rows": len(rows),
+        "min_id": rows[0]["id"],
+        "max_id": rows[-1]["id"],
+        "sha256": _sha256(target),
+        "archived_at": timezone.now().isoformat(),
+    }
+
+
+def _append_manifest(root, entries):
+    with open(root / MANIFEST, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_manifest(path=None):
+    """-> {relative part path: entry}, last line wins."""
+    manifest = archive_dir(path) / MANIFEST
+    parts = {}
+    if manifest.exists():
+        with open(manifest, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    parts[entry["path"]] = entry
+    return parts
+
+
+def iter_archived(since=None, until=None, path=None, verify=True):
+    """Stream archived rows for local dates since <= date <= until, oldest first."""
+    root = archive_dir(path)
+    parts = sorted(
+        read_manifest(path).values(),
+        key=lambda e: (e["date"], e["min_id"]),
+    )
+    for entry in parts:
+        if since and entry["date"] < since.isoformat():
+            continue
+        if until and entry["date"] > until.isoformat():
+            continue
+
+        part = root / entry["path"]
+        if not part.exists():
+            raise ArchiveError(f"Missing archive part {entry['path']}")
+        if verify and _sha256(part) != entry["sha256"]:
+            raise ArchiveError(f"Checksum mismatch for {entry['path']}")
+
+        with gzip.open(part, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
@@ -0,0 +1,280 @@
+"""
+Attendance as per-intern monthly bitsets.
+
+AttendanceMonth holds two ints per intern and local month, present_bits
+and validated_bits, with bit d-1 set when the intern checked in on day d.
+Check-in writes OR the bit in (record_days); deleting attendance recomputes
+that intern-month from Attendance after commit (on_attendance_deleted), and
+the admin cannot add or edit rows behind the bits' back. `manage.py
+backfill_attendance_calendar` rebuilds months from Attendance.
+
+Rates, streaks and absences over a date range (at most MAX_RANGE_DAYS,
+ending today at the latest) then read one small row per intern per month
+and work on the bits. Each intern's range starts no earlier than the day
+their account was created, so days before they joined are not absences.
+
+    working days   weekdays not in ATTENDANCE_WEEKEND_DAYS and not a Holiday,
+                   as one mask per month shared by every intern
+    counts         popcount(bits & working & range)
+    streaks        the working days of the range packed into one int per
+                   intern (most recent day = bit 0): current streak is the
+                   run of trailing ones, longest via x &= x >> 1
+"""
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from . import rollups
+from .models import Attendance, AttendanceMonth, Holiday
+from .utils import local_today, local_tz, next_month
+
+FULL_MONTH = (1 << 31) - 1
+MAX_RANGE_DAYS = 366
+
+
+def weekend_days():
+    raw = getattr(settings, "ATTENDANCE_WEEKEND_DAYS", "5")
+    return {int(d) for d in str(raw).split(",") if d.strip()}
+
+
+def _popcount(x):
+    return bin(x).count("1")
+
+
+def _months(start, end):
+    y, m = start.year, start.month
+    while (y, m) <= (end.year, end.month):
+        yield y, m
+        y, m = next_month(y, m)
+
+
+def _range_mask(year, month, start, end):
+    """Bits of the days of (year, month) that fall inside [start, end]."""
+    last = calendar.monthrange(year, month)[1]
+    first_day = start.day if (year, month) == (start.year, start.month) else 1
+    last_day = end.day if (year, month) == (end.year, end.month) else last
+    return ((1 << last_day) - 1) & ~((1 << (first_day - 1)) - 1)
+
+
+def working_masks(start, end):
+    """{(year, month): bits of working days within [start, end]} (one Holiday query)."""
+    weekend = weekend_days()
+    holidays = set(Holiday.objects.filter(date__gte=start, date__lte=end).values_list("date", flat=True))
+    masks = {}
+    for year, month in _months(start, end):
+        mask = 0
+        first_weekday, days = calendar.monthrange(year, month)
+        for d in range(days):
+            if (first_weekday + d) % 7 not in weekend and date(year, month, d + 1) not in holidays:
+                mask |= 1 << d
+        masks[(year, month)] = mask & _range_mask(year, month, start, end)
+    return masks
+
+
+# ---------- writes ----------
+def record_days(items):
+    """
+    items: iterable of (intern_id, day, validated). Sets the present bit and
+    sets/clears the validated bit; one UPDATE per (intern, month) touched.
+    """
+    changes = defaultdict(lambda: [0, 0, 0])  # present |=, validated |=, validated &= ~
+    for intern_id, day, validated in items:
+        bit = 1 << (day.day - 1)
+        c = changes[(intern_id, day.year, day.month)]
+        c[0] |= bit
+        if validated:
+            c[1] |= bit
+            c[2] &= ~bit
+        else:
+            c[2] |= bit
+            c[1] &= ~bit
+    if not changes:
+        return
+
+    with transaction.atomic():
+        AttendanceMonth.objects.bulk_create(
+            [AttendanceMonth(intern_id=i, year=y, month=m) for i, y, m in changes],
+            ignore_conflicts=True,
+        )
+        for (intern_id, year, month), (present, set_valid, clear_valid) in changes.items():
+            AttendanceMonth.objects.filter(intern_id=intern_id, year=year, month=month).update(
+                present_bits=F("present_bits").bitor(present),
+                validated_bits=F("validated_bits").bitand(FULL_MONTH ^ clear_valid).bitor(set_valid),
+            )
+
+
+def rebuild_month(year, month):
+    """Recompute one month's rows from Attendance.work_date."""
+    start = date(year, month, 1)
+    end = date(*next_month(year, month), 1) - timedelta(days=1)
+    bits = defaultdict(lambda: [0, 0])
+    rows = Attendance.objects.filter(work_date__gte=start, work_date__lte=end).values_list(
+        "intern_id", "work_date", "location_validated"
+    )
+    for intern_id, day, validated in rows.iterator(chunk_size=5000):
+        bit = 1 << (day.day - 1)
+        bits[intern_id][0] |= bit
+        if validated:
+            bits[intern_id][1] |= bit
+
+    with transaction.atomic():
+        AttendanceMonth.objects.filter(year=year, month=month).delete()
+        AttendanceMonth.objects.bulk_create([
+            AttendanceMonth(intern_id=i, year=year, month=month, present_bits=p, validated_bits=v)
+            for i, (p, v) in bits.items()
+        ], batch_size=1000)
+    return len(bits)
+
+
+def refresh_intern_month(intern_id, year, month):
+    """Recompute one intern's month (bits and rollup attendance counters) from Attendance."""
+    start = date(year, month, 1)
+    end = date(*next_month(year, month), 1) - timedelta(days=1)
+    present = validated = 0
+    rows = Attendance.objects.filter(intern_id=intern_id, work_date__gte=start, work_date__lte=end)
+    for day, valid in rows.values_list("work_date", "location_validated"):
+        present |= 1 << (day.day - 1)
+        if valid:
+            validated |= 1 << (day.day - 1)
+
+    with transaction.atomic():
+        if present:
+            AttendanceMonth.objects.update_or_create(
+                intern_id=intern_id, year=year, month=month,
+                defaults={"present_bits": present, "validated_bits": validated},
+            )
+        else:
+            AttendanceMonth.objects.filter(intern_id=intern_id, year=year, month=month).delete()
+        rollups.set_attendance(intern_id, year, month, _popcount(present), _popcount(validated))
+
+
+def on_attendance_deleted(sender, instance, origin=None, **kwargs):
+    # a deleted intern takes their AttendanceMonth/InternMonthlyStats rows along
+    if origin is not None and getattr(origin, "model", type(origin))._meta.label == settings.AUTH_USER_MODEL:
+        return
+    if instance.work_date:
+        day = instance.work_date
+        transaction.on_commit(lambda: refresh_intern_month(instance.intern_id, day.year, day.month))
+
+
+# ---------- reads ----------
+def parse_range(params):
+    """
+    ?from=&to= (YYYY-MM-DD) -> (start, end); defaults to this month up to
+    today, `to` is clamped to today. ValueError if invalid.
+    """
+    today = local_today()
+    try:
+        start = parse_date(params.get("from") or "") if params.get("from") else today.replace(day=1)
+        end = parse_date(params.get("to") or "") if params.get("to") else today
+    except ValueError:
+        start = end = None
+    if start is None or end is None:
+        raise ValueError("from/to must be YYYY-MM-DD")
+    end = min(end, today)
+    if start > today:
+        raise ValueError("from must not be in the future")
+    if end < start:
+        raise ValueError("to must not be before from")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"Range must be at most {MAX_RANGE_DAYS} days")
+    return start, end
+
+
+def board(interns, start, end, absences=False):
+    """interns: [(id, full_name, email, created_at)] -> rates payload."""
+    tz = local_tz()
+    joined = {i: timezone.localtime(created, tz).date() for i, _, _, created in interns}
+    stats = summaries(joined, start, end, absences=absences)
+    return {
+        "from": start,
+        "to": end,
+        "interns": [
+            {"id": intern_id, "name": name, "email": email, **stats[intern_id]}
+            for intern_id, name, email, _ in interns
+        ],
+    }
+
+
+def _load(intern_ids, start, end):
+    q = Q(year__gt=start.year) | Q(year=start.year, month__gte=start.month)
+    q &= Q(year__lt=end.year) | Q(year=end.year, month__lte=end.month)
+    rows = AttendanceMonth.objects.filter(q, intern_id__in=intern_ids).values_list(
+        "intern_id", "year", "month", "present_bits", "validated_bits"
+    )
+    found = defaultdict(dict)
+    for intern_id, year, month, present, validated in rows:
+        found[intern_id][(year, month)] = (present, validated)
+    return found
+
+
+def _longest_run(x):
+    n = 0
+    while x:
+        x &= x >> 1
+        n += 1
+    return n
+
+
+def summaries(joined, start, end, absences=False):
+    """
+    joined: {intern_id: first day that counts for them (date joined) or None}
+    -> {intern_id: {working_days, present, validated, rate, validated_rate,
+    current_streak, longest_streak, absent[, absences]}} over
+    [max(start, joined), end].
+    """
+    masks = working_masks(start, end)
+    # working-day positions per month, most recent first, for packing streak bits
+    positions = [
+        (key, [d for d in range(30, -1, -1) if mask >> d & 1])
+        for key, mask in sorted(masks.items(), reverse=True)
+    ]
+    found = _load(list(joined), start, end)
+
+    out = {}
+    for intern_id, first in joined.items():
+        first = max(first or start, start)
+        first_key = (first.year, first.month)
+        months = found.get(intern_id, {})
+        working = present = validated = 0
+        packed, pos = 0, 0
+        missed = []
+        for key, days in positions:
+            if key < first_key:
+                break
+            mask = masks[key]
+            if key == first_key:
+                mask &= ~((1 << (first.day - 1)) - 1)
+            p, v = months.get(key, (0, 0))
+            working += _popcount(mask)
+            present += _popcount(p & mask)
+            validated += _popcount(v & mask)
+            for d in days:
+                if not mask >> d & 1:
+                    break  # before the intern joined
+                if p >> d & 1:
+                    packed |= 1 << pos
+                elif absences:
+                    missed.append(date(key[0], key[1], d + 1))
+                pos += 1
+
+        row = {
+            "working_days": working,
+            "present": present,
+            "validated": validated,
+            "absent": working - present,
+            "rate": round(present / working, 4) if working else None,
+            "validated_rate": round(validated / working, 4) if working else None,
+            "current_streak": (packed ^ (packed + 1)).bit_length() - 1,
+            "longest_streak": _longest_run(packed),
+        }
+        if absences:
+            row["absences"] = sorted(missed)
+        out[intern_id] = row
+    return out
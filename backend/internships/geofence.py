@@ -0,0 +1,159 @@
+"""
+Attendance geofence over OfficeLocation sites.
+
+Sites are few and rarely edited, while check-ins are hot, so each process
+keeps an in-memory grid index: the world is cut into GEOFENCE_CELL_DEG
+cells and every site is listed under each cell its radius' bounding box
+touches. A check-in looks up one cell and runs haversine only against the
+handful of sites listed there.
+
+Saving or deleting a site bumps a version in the cache (after commit);
+the index is rebuilt when the version it was built from is stale, or at
+the latest GEOFENCE_REFRESH_SECONDS after the last build, which covers
+per-process caches (locmem) that never see another worker's bump.
+
+With no active sites, the single OFFICE_LAT/OFFICE_LNG/OFFICE_RADIUS_M
+from settings is used as before.
+"""
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import OfficeLocation
+from .utils import haversine_m
+
+VERSION_KEY = "geofence:version"
+METERS_PER_DEG_LAT = 111320.0
+
+
+@dataclass(frozen=True)
+class Site:
+    id: int | None  # None for the settings office
+    name: str
+    lat: float
+    lng: float
+    radius_m: float
+
+
+@dataclass(frozen=True)
+class Match:
+    site: Site | None  # nearest site, matched or not
+    distance_m: float | None
+    validated: bool
+
+    @property
+    def office_id(self):
+        return self.site.id if self.site and self.validated else None
+
+
+def _cell_size():
+    return float(getattr(settings, "GEOFENCE_CELL_DEG", 0.01))
+
+
+def _cell(lat, lng, size):
+    return math.floor(lat / size), math.floor(lng / size)
+
+
+class GridIndex:
+    def __init__(self, sites, cell_deg):
+        self.sites = list(sites)
+        self.cell_deg = cell_deg
+        self.cells = {}
+        for site in self.sites:
+            dlat = site.radius_m / METERS_PER_DEG_LAT
+            dlng = site.radius_m / (METERS_PER_DEG_LAT * max(math.cos(math.radians(site.lat)), 1e-6))
+            lat0, lng0 = _cell(site.lat - dlat, site.lng - dlng, cell_deg)
+            lat1, lng1 = _cell(site.lat + dlat, site.lng + dlng, cell_deg)
+            for i in range(lat0, lat1 + 1):
+                for j in range(lng0, lng1 + 1):
+                    self.cells.setdefault((i, j), []).append(site)
+
+    def locate(self, lat, lng):
+        """Nearest site whose radius contains the point; else the nearest site overall."""
+        best = None
+        for site in self.cells.get(_cell(lat, lng, self.cell_deg), ()):
+            d = haversine_m(lat, lng, site.lat, site.lng)
+            if d <= site.radius_m and (best is None or d < best[1]):
+                best = (site, d)
+        if best:
+            return Match(best[0], best[1], True)
+
+        # not inside any site: report the distance to the closest one
+        for site in self.sites:
+            d = haversine_m(lat, lng, site.lat, site.lng)
+            if best is None or d < best[1]:
+                best = (site, d)
+        if best is None:
+            return Match(None, None, False)
+        return Match(best[0], best[1], False)
+
+
+def settings_site():
+    lat = float(getattr(settings, "OFFICE_LAT", 0) or 0)
+    lng = float(getattr(settings, "OFFICE_LNG", 0) or 0)
+    if not (lat and lng):
+        return None
+    radius_m = float(getattr(settings, "OFFICE_RADIUS_M", 150) or 150)
+    return Site(None, "Office", lat, lng, radius_m)
+
+
+def load_sites():
+    sites = [
+        Site(*row)
+        for row in OfficeLocation.objects.filter(is_active=True)
+        .order_by("id")
+        .values_list("id", "name", "lat", "lng", "radius_m")
+    ]
+    if not sites:
+        fallback = settings_site()
+        sites = [fallback] if fallback else []
+    return sites
+
+
+_lock = threading.Lock()
+_state = {"index": None, "version": None, "built": 0.0}
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_index():
+    version = _current_version()
+    max_age = float(getattr(settings, "GEOFENCE_REFRESH_SECONDS", 60))
+    index = _state["index"]
+    if index is not None and _state["version"] == version and time.monotonic() - _state["built"] < max_age:
+        return index
+
+    with _lock:
+        if _state["index"] is not index:
+            return _state["index"]  # another thread rebuilt it meanwhile
+        index = GridIndex(load_sites(), _cell_size())
+        _state.update(index=index, version=version, built=time.monotonic())
+        return index
+
+
+def locate(lat, lng):
+    return get_index().locate(lat, lng)
+
+
+def invalidate():
+    def _bump():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+    transaction.on_commit(_bump)
+
+
+def on_office_changed(sender, **kwargs):
+    invalidate()
@@ -0,0 +1,36 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from internships.archive import archive_before, archive_dir
+
+
+class Command(BaseCommand):
+    help = "Move ActivityLog rows older than the retention window into gzip'd JSONL archive files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.ACTIVITY_RETENTION_DAYS,
+                            help="Keep this many days in the table (default: ACTIVITY_RETENTION_DAYS)")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per archive/delete chunk")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between chunks")
+        parser.add_argument("--dir", help="Archive directory (default: ACTIVITY_ARCHIVE_DIR)")
+        parser.add_argument("--dry-run", action="store_true", help="Count rows only, write/delete nothing")
+
+    def handle(self, *args, **opts):
+        cutoff = timezone.now() - timedelta(days=opts["days"])
+        self.stdout.write(f"Archiving activity before {cutoff.isoformat()} into {archive_dir(opts['dir'])}")
+
+        total = 0
+        for chunk in archive_before(cutoff, opts["chunk_size"], opts["dir"], opts["dry_run"]):
+            total += chunk["rows"]
+            self.stdout.write(
+                f"ids {chunk['first_id']}..{chunk['last_id']}: {chunk['rows']} rows over {chunk['days']} day(s)"
+            )
+            if opts["sleep"]:
+                time.sleep(opts["sleep"])
+
+        verb = "would archive" if opts["dry_run"] else "archived"
+        self.stdout.write(self.style.SUCCESS(f"Done. {verb} {total} rows."))
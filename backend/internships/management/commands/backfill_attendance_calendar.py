@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+
+from internships.attendance_calendar import rebuild_month
+from internships.models import Attendance
+from internships.rollups import iter_months
+
+
+def _parse_month(value: str):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise CommandError(f"Invalid month '{value}', expected YYYY-MM")
+
+
+class Command(BaseCommand):
+    help = "Rebuild AttendanceMonth bitsets from Attendance rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="start", help="First month (YYYY-MM). Default: first attendance month")
+        parser.add_argument("--to", dest="end", help="Last month (YYYY-MM). Default: last attendance month")
+
+    def handle(self, *args, **opts):
+        bounds = Attendance.objects.aggregate(first=Min("work_date"), last=Max("work_date"))
+        start = _parse_month(opts["start"]) if opts["start"] else bounds["first"]
+        end = _parse_month(opts["end"]) if opts["end"] else bounds["last"]
+        if start is None or end is None:
+            self.stdout.write("No attendance to backfill.")
+            return
+        if end < start:
+            raise CommandError("--to must not be before --from")
+
+        for year, month in iter_months(start, end):
+            n = rebuild_month(year, month)
+            self.stdout.write(f"{year}-{month:02d}: {n} intern rows")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
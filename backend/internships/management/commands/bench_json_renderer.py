@@ -0,0 +1,77 @@
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+from core.renderers import FastJSONRenderer
+
+
+class Command(BaseCommand):
+    help = "Compare JSON renderers on an AdminAttendanceView-shaped payload."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        now = timezone.now()
+        rows = [
+            {
+                "id": n,
+                "intern": f"Intern {n % 500}",
+                "email": f"intern{n % 500}@example.com",
+                "in_office": bool(n % 2),
+                "location_validated": bool(n % 3),
+                "distance_m": n % 400 + 0.25,
+                "created_at": now - timedelta(minutes=n, microseconds=n),
+            }
+            for n in range(opts["rows"])
+        ]
+
+        # what the views did before: isoformat() per row, then the stdlib renderer
+        def stdlib_preformatted():
+            data = [dict(r, created_at=r["created_at"].isoformat()) for r in rows]
+            return JSONRenderer().render(data)
+
+        def fallback():
+            orjson, renderers.orjson = renderers.orjson, None
+            try:
+                return FastJSONRenderer().render(rows)
+            finally:
+                renderers.orjson = orjson
+
+        def fast():
+            return FastJSONRenderer().render(rows)
+
+        cases = [("stdlib + isoformat", stdlib_preformatted), ("fallback encoder", fallback)]
+        if renderers.orjson is not None:
+            cases.append(("orjson", fast))
+        else:
+            self.stdout.write(self.style.WARNING("orjson is not installed, skipping it"))
+
+        outputs = {}
+        for name, fn in cases:
+            best = None
+            for _ in range(opts["repeat"]):
+                t0 = time.perf_counter()
+                out = fn()
+                elapsed = time.perf_counter() - t0
+                best = elapsed if best is None else min(best, elapsed)
+
+            tracemalloc.start()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            outputs[name] = out
+            self.stdout.write(
+                f"{name:>20}: {best * 1000:7.1f} ms  peak alloc {peak / 1024 / 1024:6.1f} MiB  {len(out)} bytes"
+            )
+
+        if len(set(outputs.values())) != 1:
+            raise CommandError("Renderers produced different bytes")
+        self.stdout.write(self.style.SUCCESS("All renderers produced identical bytes."))
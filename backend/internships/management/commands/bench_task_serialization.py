@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import User
+from internships.models import Task
+from internships.projections import TASK_VALUES, task_rows
+from internships.serializers import TaskSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare TaskSerializer with the values() projection on one supervisor's task list."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Synthetic tasks to create (rolled back)")
+        parser.add_argument("--supervisor", help="Benchmark an existing supervisor's tasks (email) instead")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        if opts["supervisor"]:
+            sup = User.objects.filter(email=opts["supervisor"].lower(), role="SUPERVISOR").first()
+            if not sup:
+                raise CommandError("Supervisor not found")
+            self._run(sup, opts["repeat"])
+            return
+
+        try:
+            with transaction.atomic():
+                sup = User.objects.create_user(email="bench-sup@example.invalid", full_name="Bench Supervisor", role="SUPERVISOR")
+                intern = User.objects.create_user(email="bench-intern@example.invalid", full_name="Bench Intern", role="INTERN")
+                Task.objects.bulk_create(
+                    [
+                        Task(supervisor=sup, intern=intern, title=f"Task {n}", description="x" * 200,
+                             star_rating=(n % 5 + 1) if n % 3 else None)
+                        for n in range(opts["rows"])
+                    ],
+                    batch_size=1000,
+                )
+                self._run(sup, opts["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, sup, repeat):
+        tasks = Task.objects.filter(supervisor=sup).order_by("-created_at", "-id")
+        renderer = JSONRenderer()
+
+        def serializer():
+            return TaskSerializer(tasks.select_related("intern", "supervisor"), many=True).data
+
+        def projection():
+            return task_rows(tasks.values(*TASK_VALUES))
+
+        results = {}
+        for name, fn in (("serializer", serializer), ("projection", projection)):
+            best = None
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                data = fn()
+                elapsed = time.perf_counter() - t0
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = (best, renderer.render(data))
+            self.stdout.write(f"{name:>10}: {len(data)} rows, best of {repeat}: {best * 1000:.1f} ms")
+
+        if results["serializer"][1] != results["projection"][1]:
+            raise CommandError("Projection output differs from TaskSerializer")
+        speedup = results["serializer"][0] / results["projection"][0] if results["projection"][0] else 0
+        self.stdout.write(self.style.SUCCESS(f"Identical output, {speedup:.1f}x faster"))
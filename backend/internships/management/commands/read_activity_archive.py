@@ -0,0 +1,39 @@
+import json
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from internships.archive import ArchiveError, iter_archived
+
+
+def _date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = "Stream archived ActivityLog rows (JSON Lines) for a local date range, verifying checksums."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="First date (YYYY-MM-DD, inclusive)")
+        parser.add_argument("--until", help="Last date (YYYY-MM-DD, inclusive)")
+        parser.add_argument("--actor", type=int, help="Only rows by this actor id")
+        parser.add_argument("--verb", help="Only rows with this verb")
+        parser.add_argument("--dir", help="Archive directory (default: ACTIVITY_ARCHIVE_DIR)")
+        parser.add_argument("--no-verify", action="store_true", help="Skip sha256 checks")
+
+    def handle(self, *args, **opts):
+        verb = (opts["verb"] or "").upper()
+        rows = iter_archived(_date(opts["since"]), _date(opts["until"]), opts["dir"], not opts["no_verify"])
+
+        try:
+            for row in rows:
+                if opts["actor"] and row["actor_id"] != opts["actor"]:
+                    continue
+                if verb and row["verb"] != verb:
+                    continue
+                self.stdout.write(json.dumps(row, separators=(",", ":")))
+        except ArchiveError as e:
+            raise CommandError(str(e))
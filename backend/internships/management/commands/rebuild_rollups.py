@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from internships.rollups import iter_months, rebuild_month
+
+
+def _parse_month(value: str):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise CommandError(f"Invalid month '{value}', expected YYYY-MM")
+
+
+class Command(BaseCommand):
+    help = "Recompute InternMonthlyStats from raw Task/Attendance/TaskReport/Complaint rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="start", help="First month (YYYY-MM). Default: current month")
+        parser.add_argument("--to", dest="end", help="Last month (YYYY-MM). Default: --from")
+
+    def handle(self, *args, **opts):
+        today = timezone.localdate()
+        start = _parse_month(opts["start"]) if opts["start"] else today.replace(day=1)
+        end = _parse_month(opts["end"]) if opts["end"] else start
+        if end < start:
+            raise CommandError("--to must not be before --from")
+
+        for year, month in iter_months(start, end):
+            n = rebuild_month(year, month)
+            self.stdout.write(f"{year}-{month:02d}: {n} intern rows")
+
+        self.stdout.write(self.style.SUCCESS("Done."))
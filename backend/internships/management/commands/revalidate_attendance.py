@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from internships.revalidate import CHUNK, revalidate
+from internships.utils import local_tz
+
+
+class Command(BaseCommand):
+    help = "Recompute Attendance location validation against the current sites and flag impossible travel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Only rows created on/after this date (YYYY-MM-DD)")
+        parser.add_argument("--chunk", type=int, default=CHUNK, help="Rows loaded per query")
+        parser.add_argument("--dry-run", action="store_true", help="Report counts without writing")
+
+    def handle(self, *args, **opts):
+        since = None
+        if opts["since"]:
+            try:
+                since = datetime.strptime(opts["since"], "%Y-%m-%d").replace(tzinfo=local_tz())
+            except ValueError:
+                raise CommandError(f"Invalid date '{opts['since']}', expected YYYY-MM-DD")
+
+        result = revalidate(since=since, dry_run=opts["dry_run"], chunk=max(1, opts["chunk"]))
+        r = result.as_dict()
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. rows={r['rows']}, changed={r['updated']}, validated={r['validated']}, "
+            f"impossible_travel={r['impossible_travel']} in {r['seconds']}s"
+            + (" (dry run)" if opts["dry_run"] else "")
+        ))
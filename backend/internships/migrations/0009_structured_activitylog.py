@@ -0,0 +1,122 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:15
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# (verb, target_type, pattern) for the free-text actions written so far;
+# named groups other than "id" go into the payload
+PATTERNS = [
+    ("TASK_CREATE", "task", r"Created task (?P<id>\d+) for (?P<intern>\S+)$"),
+    ("TASK_STATUS", "task", r"Updated task (?P<id>\d+) -> (?P<status>\w+)$"),
+    ("TASK_RATE", "task", r"Rated task (?P<id>\d+) \((?P<stars>\d) stars\)$"),
+    ("REPORT_SUBMIT", "task", r"Submitted report for task (?P<id>\d+)$"),
+    ("ATTENDANCE_MARK", "", r"Marked attendance \(in_office=(?P<in_office>\w+), validated=(?P<validated>\w+)\)$"),
+    ("COMPLAINT_CREATE", "complaint", r"Created complaint (?P<id>\d+)$"),
+    ("COMPLAINT_STATUS", "complaint", r"Updated complaint (?P<id>\d+) -> (?P<status>\w+)$"),
+    ("INTERN_ASSIGN", "", r"Assigned (?P<intern>\S+) -> (?P<supervisor>\S+)$"),
+    ("INTERN_UNASSIGN", "", r"Unassigned (?P<intern>\S+)$"),
+]
+PATTERNS = [(verb, target_type, re.compile(rx)) for verb, target_type, rx in PATTERNS]
+
+
+def _value(v):
+    if v in ("True", "False"):
+        return v == "True"
+    return int(v) if v.isdigit() else v
+
+
+def parse_action(action):
+    for verb, target_type, rx in PATTERNS:
+        m = rx.match(action)
+        if m:
+            fields = m.groupdict()
+            target_id = fields.pop("id", None)
+            return {
+                "verb": verb,
+                "target_type": target_type if target_id else "",
+                "target_id": int(target_id) if target_id else None,
+                "payload": {k: _value(v) for k, v in fields.items()},
+            }
+    return None
+
+
+def backfill(apps, schema_editor):
+    ActivityLog = apps.get_model("internships", "ActivityLog")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    last_id = 0
+    while True:
+        chunk = list(
+            ActivityLog.objects.filter(id__gt=last_id).order_by("id").only("id", "action")[:2000]
+        )
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+
+        changed = []
+        for log in chunk:
+            parsed = parse_action(log.action)
+            if parsed:
+                for k, v in parsed.items():
+                    setattr(log, k, v)
+                changed.append(log)
+
+        # assign/unassign only recorded the intern's email; resolve it to the user
+        emails = {
+            log.payload["intern"] for log in changed
+            if log.verb in ("INTERN_ASSIGN", "INTERN_UNASSIGN")
+        }
+        if emails:
+            ids = dict(User.objects.filter(email__in=emails).values_list("email", "id"))
+            for log in changed:
+                if log.verb in ("INTERN_ASSIGN", "INTERN_UNASSIGN") and log.payload["intern"] in ids:
+                    log.target_type = "user"
+                    log.target_id = ids[log.payload["intern"]]
+
+        ActivityLog.objects.bulk_update(changed, ["verb", "target_type", "target_id", "payload"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0008_activitylog_created_at_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='payload',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='target_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='target_type',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='verb',
+            field=models.CharField(choices=[('TASK_CREATE', 'Task created'), ('TASK_STATUS', 'Task status updated'), ('TASK_RATE', 'Task rated'), ('REPORT_SUBMIT', 'Report submitted'), ('ATTENDANCE_MARK', 'Attendance marked'), ('COMPLAINT_CREATE', 'Complaint created'), ('COMPLAINT_STATUS', 'Complaint status updated'), ('INTERN_ASSIGN', 'Intern assigned'), ('INTERN_UNASSIGN', 'Intern unassigned'), ('OTHER', 'Other')], default='OTHER', max_length=32),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['actor', '-created_at'], name='activitylog_actor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['verb', '-created_at'], name='activitylog_verb_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['target_type', 'target_id', '-created_at'], name='activitylog_target_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0010_complaint_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfficeLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120)),
+                ('lat', models.FloatField()),
+                ('lng', models.FloatField()),
+                ('radius_m', models.FloatField(default=150)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='office',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='attendance', to='internships.officelocation'),
+        ),
+    ]
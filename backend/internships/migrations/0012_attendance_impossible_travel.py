@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0011_office_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='impossible_travel',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,59 @@
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_work_date(apps, schema_editor):
+    """
+    work_date = created_at in TIME_ZONE. Where an intern has several rows for
+    one day, keep a validated one if any (else the earliest) and drop the rest.
+    Run `manage.py rebuild_rollups` for affected months afterwards.
+    """
+    Attendance = apps.get_model("internships", "Attendance")
+    tz = ZoneInfo(settings.TIME_ZONE)
+
+    rows = (
+        Attendance.objects
+        .order_by("intern_id", "created_at", "id")
+        .values_list("id", "intern_id", "created_at", "location_validated")
+    )
+    keep = {}  # (intern, day) -> (id, validated)
+    updates, duplicates = [], []
+
+    for pk, intern_id, created_at, validated in rows.iterator(chunk_size=5000):
+        day = created_at.astimezone(tz).date()
+        key = (intern_id, day)
+        kept = keep.get(key)
+        if kept is None:
+            keep[key] = (pk, validated)
+            updates.append(Attendance(id=pk, work_date=day))
+        elif validated and not kept[1]:
+            duplicates.append(kept[0])
+            keep[key] = (pk, validated)
+            updates.append(Attendance(id=pk, work_date=day))
+        else:
+            duplicates.append(pk)
+
+    for i in range(0, len(duplicates), 1000):
+        Attendance.objects.filter(id__in=duplicates[i:i + 1000]).delete()
+    dropped = set(duplicates)
+    Attendance.objects.bulk_update(
+        [a for a in updates if a.id not in dropped], ["work_date"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("internships", "0012_attendance_impossible_travel"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attendance",
+            name="work_date",
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(backfill_work_date, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+import internships.utils
+
+
+class Migration(migrations.Migration):
+    # separate from the backfill so the ALTER does not share its transaction
+
+    dependencies = [
+        ("internships", "0013_attendance_work_date"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="attendance",
+            name="work_date",
+            field=models.DateField(default=internships.utils.local_today),
+        ),
+        migrations.AddConstraint(
+            model_name="attendance",
+            constraint=models.UniqueConstraint(fields=("intern", "work_date"), name="attendance_intern_day_uniq"),
+        ),
+    ]
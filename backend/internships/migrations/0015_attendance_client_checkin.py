@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0014_attendance_work_date_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='client_key',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='client_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
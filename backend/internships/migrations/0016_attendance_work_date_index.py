@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0015_attendance_client_checkin'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['work_date'], name='attendance_work_date_idx'),
+        ),
+    ]
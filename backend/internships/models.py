@@ -1,5 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+from .utils import local_today
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -17,21 +20,64 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["supervisor", "-created_at"], name="task_supervisor_created_idx"),
+            models.Index(fields=["intern", "-created_at"], name="task_intern_created_idx"),
+            models.Index(fields=["created_at"], name="task_created_idx"),  # monthly report ranges
+        ]
+
 class TaskReport(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="reports")
     intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="task_reports")
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "-created_at"], name="taskreport_task_created_idx"),
+        ]
+
+class OfficeLocation(models.Model):
+    """An office or client site interns can check in at (see geofence.py)."""
+    name = models.CharField(max_length=120)
+    lat = models.FloatField()
+    lng = models.FloatField()
+    radius_m = models.FloatField(default=150)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
 class Attendance(models.Model):
     intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="attendance")
     created_at = models.DateTimeField(auto_now_add=True)
+    # local (TIME_ZONE) day the check-in counts for; one row per intern per day
+    work_date = models.DateField(default=local_today)
+    # offline batch check-ins (intern/attendance/batch/): device time and the client's idempotency key
+    client_time = models.DateTimeField(null=True, blank=True)
+    client_key = models.CharField(max_length=64, blank=True, default="")
     in_office = models.BooleanField(default=False)
     lat = models.FloatField(null=True, blank=True)
     lng = models.FloatField(null=True, blank=True)
     office_distance_m = models.FloatField(null=True, blank=True)
+    # site the check-in matched; null when none did (or only the settings office is configured)
+    office = models.ForeignKey(OfficeLocation, null=True, blank=True, on_delete=models.SET_NULL, related_name="attendance")
+    # set by `manage.py revalidate_attendance` (internships/revalidate.py)
+    impossible_travel = models.BooleanField(default=False)
     location_validated = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["intern", "-created_at"], name="attendance_intern_created_idx"),
+            models.Index(fields=["work_date"], name="attendance_work_date_idx"),  # presence.load_day
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["intern", "work_date"], name="attendance_intern_day_uniq"),
+        ]
+
 class Complaint(models.Model):
     STATUS_CHOICES = [("OPEN","Open"),("IN_REVIEW","In Review"),("RESOLVED","Resolved")]
     intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="complaints_made")
@@ -40,8 +86,105 @@ class Complaint(models.Model):
     message = models.TextField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="OPEN")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["supervisor", "-created_at"], name="complaint_sup_created_idx"),
+        ]
 
 class ActivityLog(models.Model):
+    class Verb(models.TextChoices):
+        TASK_CREATE = "TASK_CREATE", "Task created"
+        TASK_STATUS = "TASK_STATUS", "Task status updated"
+        TASK_RATE = "TASK_RATE", "Task rated"
+        REPORT_SUBMIT = "REPORT_SUBMIT", "Report submitted"
+        ATTENDANCE_MARK = "ATTENDANCE_MARK", "Attendance marked"
+        COMPLAINT_CREATE = "COMPLAINT_CREATE", "Complaint created"
+        COMPLAINT_STATUS = "COMPLAINT_STATUS", "Complaint status updated"
+        INTERN_ASSIGN = "INTERN_ASSIGN", "Intern assigned"
+        INTERN_UNASSIGN = "INTERN_UNASSIGN", "Intern unassigned"
+        OTHER = "OTHER", "Other"
+
     actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="activity_logs")
-    action = models.CharField(max_length=500)
+    verb = models.CharField(max_length=32, choices=Verb.choices, default=Verb.OTHER)
+    target_type = models.CharField(max_length=32, blank=True, default="")  # "task", "complaint", "user", ...
+    target_id = models.BigIntegerField(null=True, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    action = models.CharField(max_length=500)  # rendered text for display
+    # set when the entry is queued, not when the buffered writer flushes it
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at"], name="activitylog_created_idx"),
+            models.Index(fields=["actor", "-created_at"], name="activitylog_actor_created_idx"),
+            models.Index(fields=["verb", "-created_at"], name="activitylog_verb_created_idx"),
+            models.Index(fields=["target_type", "target_id", "-created_at"], name="activitylog_target_idx"),
+        ]
+
+class InternMonthlyStats(models.Model):
+    # pre-aggregated per-intern counters, bucketed by local (TIME_ZONE) month
+    intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="monthly_stats")
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    tasks_created = models.PositiveIntegerField(default=0)
+    tasks_completed = models.PositiveIntegerField(default=0)
+    attendance_days = models.PositiveIntegerField(default=0)
+    validated_attendance = models.PositiveIntegerField(default=0)
+    reports = models.PositiveIntegerField(default=0)
+    complaints = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("intern", "year", "month")
+
+
+class AttendanceMonth(models.Model):
+    # one bit per day of a local month (bit 0 = day 1); see attendance_calendar.py
+    intern = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="attendance_months")
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    present_bits = models.IntegerField(default=0)
+    validated_bits = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("intern", "year", "month")
+
+
+class Holiday(models.Model):
+    # non-working days for attendance rates (weekends come from ATTENDANCE_WEEKEND_DAYS)
+    date = models.DateField(unique=True)
+    name = models.CharField(max_length=120, blank=True, default="")
+
+    def __str__(self):
+        return f"{self.date} {self.name}".strip()
+
+
+class RevalidationJob(models.Model):
+    """A queued attendance re-validation (internships/revalidate.py), run by `run_revalidation_jobs`."""
+    STATUS_CHOICES = [("QUEUED", "Queued"), ("RUNNING", "Running"), ("DONE", "Done"), ("FAILED", "Failed")]
+
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="revalidation_jobs")
+    since = models.DateTimeField(null=True, blank=True)  # only rows created on/after; null = all
+    dry_run = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="QUEUED")
+
+    rows = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    validated = models.PositiveIntegerField(default=0)
+    impossible_travel = models.PositiveIntegerField(default=0)
+    seconds = models.FloatField(default=0)
+    detail = models.TextField(blank=True, default="")
+
     created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)  # heartbeat while RUNNING
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="revaljob_status_created_idx"),
+        ]
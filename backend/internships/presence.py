@@ -0,0 +1,94 @@
+"""
+Per-day attendance presence kept in the cache.
+
+A work day is one key, presence:<day>, holding {intern_id: 1 | 0} for the
+interns who checked in (1 = with a validated location), so a board is one
+cache get whatever the number of interns. The key is loaded from the
+(work_date) index on first use and expires after PRESENCE_REBUILD_SECONDS;
+the marks and the "this day is loaded" state live and die together, so an
+evicted or expired day is simply read again instead of showing everyone
+absent.
+
+Check-ins and re-validation fold their marks into a loaded day after
+commit; a day that is not loaded is left alone (the next read gets the rows
+from the DB). Deleting attendance drops the day. Concurrent writers may
+overwrite each other's marks; the expiry bounds that, like it bounds how
+stale a per-process cache (locmem) can be when other workers take the
+writes.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Attendance
+
+KEY_PREFIX = "presence"
+
+PRESENT = "present"
+VALIDATED = "validated"
+ABSENT = "absent"
+
+
+def _key(day):
+    return f"{KEY_PREFIX}:{day.isoformat()}"
+
+
+def _ttl():
+    return getattr(settings, "PRESENCE_REBUILD_SECONDS", 60)
+
+
+def record(day, marks):
+    """marks: {intern_id: location_validated} written for `day` (after commit)."""
+    if not marks:
+        return
+    values = {intern_id: int(bool(v)) for intern_id, v in marks.items()}
+
+    def _merge():
+        key = _key(day)
+        loaded = cache.get(key)
+        if loaded is not None:
+            loaded.update(values)
+            cache.set(key, loaded, _ttl())
+    transaction.on_commit(_merge)
+
+
+def forget(day):
+    """Drop a cached day (after commit); the next read reloads it."""
+    transaction.on_commit(lambda: cache.delete(_key(day)))
+
+
+def load_day(day):
+    rows = Attendance.objects.filter(work_date=day).values_list("intern_id", "location_validated")
+    loaded = {intern_id: int(v) for intern_id, v in rows}
+    cache.set(_key(day), loaded, _ttl())
+    return loaded
+
+
+def statuses(day, intern_ids):
+    """{intern_id: "validated" | "present" | "absent"} for `day`."""
+    loaded = cache.get(_key(day))
+    if loaded is None:
+        loaded = load_day(day)
+
+    out = {}
+    for intern_id in intern_ids:
+        v = loaded.get(intern_id)
+        out[intern_id] = ABSENT if v is None else (VALIDATED if v else PRESENT)
+    return out
+
+
+def board(day, interns):
+    """interns: [(id, full_name, email)] -> presence board payload."""
+    status = statuses(day, [i for i, _, _ in interns])
+    counts = {VALIDATED: 0, PRESENT: 0, ABSENT: 0}
+    rows = []
+    for intern_id, name, email in interns:
+        s = status[intern_id]
+        counts[s] += 1
+        rows.append({"id": intern_id, "name": name, "email": email, "status": s})
+    return {"date": day, "counts": counts, "interns": rows}
+
+
+def on_attendance_deleted(sender, instance, **kwargs):
+    if instance.work_date:
+        forget(instance.work_date)
@@ -0,0 +1,60 @@
+"""
+values()-based serialization for hot list endpoints.
+
+Builds the same dicts as the matching DRF serializer (same keys, same order,
+same value formatting) straight from a .values() projection, without
+instantiating model objects or running field-by-field serialization.
+
+    rows = page.paginate(tasks.values(*TASK_VALUES))
+    data = task_rows(rows)
+
+Keep these in sync with serializers.py; `bench_task_serialization` checks
+that both paths render to identical JSON.
+"""
+from django.utils import timezone
+
+TASK_VALUES = (
+    "id",
+    "intern__full_name",
+    "supervisor__full_name",
+    "intern__email",
+    "title",
+    "description",
+    "status",
+    "star_rating",
+    "supervisor_feedback",
+    "created_at",
+    "updated_at",
+    "supervisor_id",
+    "intern_id",
+)
+
+
+def iso_datetime(value, tz=None):
+    """Same output as rest_framework.fields.DateTimeField.to_representation."""
+    if value is None:
+        return None
+    value = timezone.localtime(value, tz).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def task_rows(rows):
+    """rows: Task .values(*TASK_VALUES) dicts -> TaskSerializer-shaped dicts."""
+    tz = timezone.get_current_timezone()
+    return [{
+        "id": r["id"],
+        "intern_name": r["intern__full_name"],
+        "supervisor_name": r["supervisor__full_name"],
+        "intern_email": r["intern__email"],
+        "title": r["title"],
+        "description": r["description"],
+        "status": r["status"],
+        "star_rating": r["star_rating"],
+        "supervisor_feedback": r["supervisor_feedback"],
+        "created_at": iso_datetime(r["created_at"], tz),
+        "updated_at": iso_datetime(r["updated_at"], tz),
+        "supervisor": r["supervisor_id"],
+        "intern": r["intern_id"],
+    } for r in rows]
@@ -0,0 +1,138 @@
+"""
+On-disk cache for rendered report artifacts (monthly PDF/CSV).
+
+Files are named by (kind, period label, data version), so a changed month
+simply produces a new name; old versions are never served again and are
+removed on the next store. Total size is capped with LRU eviction, using
+mtime as the "last used" clock (touched on every hit).
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from accounts.models import User
+
+from .models import Task
+
+
+def cache_dir() -> Path:
+    path = Path(settings.REPORT_CACHE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def data_version(start, end) -> str:
+    """
+    Cheap fingerprint of the tasks in [start, end) (count, max updated_at,
+    max id) and of users (count, max updated_at), whose names the reports embed.
+    """
+    agg = Task.objects.filter(created_at__gte=start, created_at__lt=end).aggregate(
+        n=Count("id"), last=Max("updated_at"), max_id=Max("id")
+    )
+    users = User.objects.aggregate(n=Count("id"), last=Max("updated_at"))
+    raw = (
+        f"{agg['n']}|{agg['last'].isoformat() if agg['last'] else ''}|{agg['max_id'] or 0}"
+        f"|{users['n']}|{users['last'].isoformat() if users['last'] else ''}"
+    )
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def artifact_path(kind, label, version, ext) -> Path:
+    return cache_dir() / f"{kind}_{label}_{version}.{ext}"
+
+
+def open_cached(kind, label, version, ext):
+    """Open a cached artifact for reading (and mark it used), or None on a miss."""
+    path = artifact_path(kind, label, version, ext)
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass  # evicted meanwhile; the open handle still reads fine
+    return f
+
+
+def store(kind, label, version, ext, render):
+    """Call render(fileobj) into a temp file and publish it atomically."""
+    path = artifact_path(kind, label, version, ext)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=f".{ext}")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            render(f)
+        os.replace(tmp, path)
+    except BaseException:
+        _unlink(tmp)
+        raise
+
+    _drop_old_versions(kind, label, ext, keep=path)
+    evict(keep=path)
+    return path
+
+
+def stream_and_store(kind, label, version, ext, chunks):
+    """
+    Yield text chunks to the client while teeing them into the cache.
+    The artifact is only published if the stream ran to completion.
+    """
+    path = artifact_path(kind, label, version, ext)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=f".{ext}")
+    complete = False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk.encode("utf-8"))
+                yield chunk
+        os.replace(tmp, path)
+        complete = True
+    finally:
+        if not complete:
+            _unlink(tmp)
+
+    _drop_old_versions(kind, label, ext, keep=path)
+    evict(keep=path)
+
+
+def evict(max_bytes=None, keep=None):
+    """Delete least recently used artifacts (except `keep`) until the cache fits max_bytes."""
+    max_bytes = settings.REPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    entries = []
+    total = 0
+    for p in cache_dir().iterdir():
+        if p.name.startswith(".tmp-") or p == keep or not p.is_file():
+            continue
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+        total += st.st_size
+    if keep is not None and keep.exists():
+        total += keep.stat().st_size
+
+    entries.sort()
+    for _, size, p in entries:
+        if total <= max_bytes:
+            break
+        _unlink(p)
+        total -= size
+
+
+def _drop_old_versions(kind, label, ext, keep):
+    for p in cache_dir().glob(f"{kind}_{label}_*.{ext}"):
+        if p != keep:
+            _unlink(p)
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,256 @@
+"""
+Bulk re-validation of stored attendance against the current sites.
+
+Attendance rows keep the location_validated/office_distance_m/office they
+got at check-in time, so moving a site or changing its radius leaves old
+rows stale. revalidate() walks the whole table in (intern, time) order,
+CHUNK rows at a time, and does the geometry with NumPy instead of
+calling haversine_m per row:
+
+    distances   one rows x sites haversine matrix per chunk
+    match       nearest site whose radius contains the point, else nearest
+    time        when the fix was taken: client_time for offline (batch)
+                check-ins, which are stored long after they happened,
+                else created_at
+    travel      speed between consecutive fixes of the same intern; a jump
+                faster than ATTENDANCE_MAX_SPEED_KMH over more than
+                ATTENDANCE_TRAVEL_MIN_M (GPS jitter) sets impossible_travel
+
+Only rows whose values actually change are written (bulk_update); the
+monthly rollups, presence keys and attendance calendar get the matching
+validated changes in the same per-chunk transaction, so a run that dies
+half-way leaves every committed chunk consistent and can simply be re-run.
+
+Admins queue runs as RevalidationJob rows (internships/revalidation_jobs.py);
+`manage.py revalidate_attendance` runs one in the foreground.
+"""
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import attendance_calendar, geofence, presence, rollups
+from .models import Attendance
+
+CHUNK = 50_000
+EARTH_RADIUS_M = 6371000.0
+FIELDS = ["location_validated", "office_distance_m", "office", "impossible_travel"]
+COLUMNS = ("id", "intern_id", "at", "in_office", "lat", "lng",
+           "location_validated", "office_distance_m", "office_id", "impossible_travel", "work_date")
+
+
+def haversine_np(lat1, lng1, lat2, lng2):
+    """Element-wise (broadcasting) haversine in metres."""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+@dataclass
+class Result:
+    rows: int = 0
+    updated: int = 0
+    validated: int = 0
+    impossible_travel: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "updated": self.updated,
+            "validated": self.validated,
+            "impossible_travel": self.impossible_travel,
+            "seconds": round(self.seconds, 3),
+        }
+
+
+class SiteMatrix:
+    """Geofence sites as arrays, for matching many points with one haversine matrix."""
+
+    def __init__(self, sites):
+        self.ids = np.array([s.id if s.id is not None else -1 for s in sites], dtype=np.int64)
+        self.names = [s.name for s in sites]
+        self.lat = np.array([s.lat for s in sites], dtype=np.float64)
+        self.lng = np.array([s.lng for s in sites], dtype=np.float64)
+        self.radius = np.array([s.radius_m for s in sites], dtype=np.float64)
+
+    def match(self, lat, lng, check):
+        """
+        -> (distance, site index, validated) per point: the nearest containing
+        site, else the nearest site. Points where `check` is False get
+        (nan, -1, False).
+        """
+        n = len(lat)
+        distance = np.full(n, np.nan)
+        site = np.full(n, -1, dtype=np.int64)
+        validated = np.zeros(n, dtype=bool)
+        rows = np.flatnonzero(check)
+        if not len(rows) or not len(self.ids):
+            return distance, site, validated
+
+        d = haversine_np(lat[rows, None], lng[rows, None], self.lat[None, :], self.lng[None, :])
+        inside = d <= self.radius[None, :]
+        hit = inside.any(axis=1)
+        # nearest containing site if any, else nearest site (distance only)
+        best = np.where(hit, np.where(inside, d, np.inf).argmin(axis=1), d.argmin(axis=1))
+
+        distance[rows] = d[np.arange(len(rows)), best]
+        site[rows] = best
+        validated[rows] = hit
+        return distance, site, validated
+
+    def office_ids(self, site, validated):
+        """OfficeLocation id of each matched site, -1 where none matched (or the settings office)."""
+        if not len(self.ids):
+            return np.full(len(site), -1, dtype=np.int64)
+        return np.where(validated & (site >= 0), self.ids[np.maximum(site, 0)], -1)
+
+
+class Revalidator:
+    def __init__(self, sites=None, chunk=CHUNK, dry_run=False, on_chunk=None):
+        self.sites = SiteMatrix(geofence.load_sites() if sites is None else sites)
+        self.chunk = chunk
+        self.dry_run = dry_run
+        self.on_chunk = on_chunk  # called with the running Result after every chunk
+        self.max_speed = float(getattr(settings, "ATTENDANCE_MAX_SPEED_KMH", 900)) / 3.6  # m/s
+        self.min_jump = float(getattr(settings, "ATTENDANCE_TRAVEL_MIN_M", 2000))
+        self.result = Result()
+        # last fix of the previous chunk: (intern_id, epoch seconds, lat, lng)
+        self._carry = None
+
+    # ---------- streaming ----------
+    def _chunks(self, qs):
+        """Keyset pagination on (intern, time, id); each chunk is one query."""
+        qs = (
+            qs.annotate(at=Coalesce("client_time", "created_at"))
+            .order_by("intern_id", "at", "id")
+            .values_list(*COLUMNS)
+        )
+        last = None
+        while True:
+            page = qs
+            if last:
+                i, t, k = last
+                page = qs.filter(
+                    Q(intern_id__gt=i)
+                    | Q(intern_id=i, at__gt=t)
+                    | Q(intern_id=i, at=t, id__gt=k)
+                )
+            rows = list(page[: self.chunk])
+            if not rows:
+                return
+            yield rows
+            last = (rows[-1][1], rows[-1][2], rows[-1][0])
+
+    def run(self, qs=None):
+        started = timezone.now()
+        qs = Attendance.objects.all() if qs is None else qs
+        for rows in self._chunks(qs):
+            self._process(rows)
+            if self.on_chunk:
+                self.result.seconds = (timezone.now() - started).total_seconds()
+                self.on_chunk(self.result)
+        self.result.seconds = (timezone.now() - started).total_seconds()
+        return self.result
+
+    # ---------- geometry ----------
+    def _process(self, rows):
+        n = len(rows)
+        cols = list(zip(*rows))
+        ids = np.fromiter(cols[0], dtype=np.int64, count=n)
+        interns = np.fromiter(cols[1], dtype=np.int64, count=n)
+        ts = np.fromiter((c.timestamp() for c in cols[2]), dtype=np.float64, count=n)
+        in_office = np.fromiter(cols[3], dtype=bool, count=n)
+        lat = np.array([np.nan if v is None else v for v in cols[4]], dtype=np.float64)
+        lng = np.array([np.nan if v is None else v for v in cols[5]], dtype=np.float64)
+        has_fix = ~(np.isnan(lat) | np.isnan(lng))
+
+        distance, site, validated = self.sites.match(lat, lng, in_office & has_fix)
+        office = self.sites.office_ids(site, validated)
+        travel = self._impossible_travel(interns, ts, lat, lng, has_fix)
+
+        old_valid = np.fromiter(cols[6], dtype=bool, count=n)
+        old_dist = np.array([np.nan if v is None else v for v in cols[7]], dtype=np.float64)
+        old_office = np.fromiter((-1 if v is None else v for v in cols[8]), dtype=np.int64, count=n)
+        old_travel = np.fromiter(cols[9], dtype=bool, count=n)
+
+        same_dist = np.isclose(old_dist, distance, rtol=0, atol=0.01, equal_nan=True)
+        changed = (old_valid != validated) | ~same_dist | (old_office != office) | (old_travel != travel)
+
+        self.result.rows += n
+        self.result.validated += int(validated.sum())
+        self.result.impossible_travel += int(travel.sum())
+        self.result.updated += int(changed.sum())
+
+        if self.dry_run or not changed.any():
+            return
+
+        idx = np.flatnonzero(changed)
+        objs = [
+            Attendance(
+                id=int(ids[i]),
+                location_validated=bool(validated[i]),
+                office_distance_m=None if np.isnan(distance[i]) else float(distance[i]),
+                office_id=None if office[i] < 0 else int(office[i]),
+                impossible_travel=bool(travel[i]),
+            )
+            for i in idx
+        ]
+        with transaction.atomic():
+            Attendance.objects.bulk_update(objs, FIELDS, batch_size=1000)
+            by_day = {}
+            for i in idx[old_valid[idx] != validated[idx]]:
+                by_day.setdefault(cols[10][i], {})[int(interns[i])] = bool(validated[i])
+            for day, marks in by_day.items():
+                presence.record(day, marks)
+            attendance_calendar.record_days(
+                (intern_id, day, v) for day, marks in by_day.items() for intern_id, v in marks.items()
+            )
+            self._bump_rollups(cols, interns, idx, old_valid, validated)
+
+    def _impossible_travel(self, interns, ts, lat, lng, has_fix):
+        flags = np.zeros(len(interns), dtype=bool)
+        rows = np.flatnonzero(has_fix)
+        if not len(rows):
+            return flags
+
+        i, t, la, ln = interns[rows], ts[rows], lat[rows], lng[rows]
+        carry = self._carry
+        self._carry = (i[-1], t[-1], la[-1], ln[-1])
+        if carry is not None:
+            i, t, la, ln = (np.concatenate(([c], a)) for c, a in zip(carry, (i, t, la, ln)))
+
+        same = i[1:] == i[:-1]
+        jump = haversine_np(la[:-1], ln[:-1], la[1:], ln[1:])
+        dt = t[1:] - t[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speed = np.where(dt > 0, jump / dt, np.inf)
+        bad = same & (jump > self.min_jump) & (speed > self.max_speed)
+
+        # with a carried fix every row of this chunk has a predecessor
+        flags[rows] = bad if carry is not None else np.concatenate(([False], bad))
+        return flags
+
+    @staticmethod
+    def _bump_rollups(cols, interns, idx, old_valid, validated):
+        """validated_attendance deltas of this chunk, one bump per (intern, work month)."""
+        delta = validated[idx].astype(np.int64) - old_valid[idx].astype(np.int64)
+        months = Counter()
+        for i, d in zip(idx[delta != 0], delta[delta != 0]):
+            months[(int(interns[i]), cols[10][i].replace(day=1))] += int(d)
+        for (intern_id, month), d in months.items():
+            if d:
+                rollups.bump_work_day(intern_id, month, validated_attendance=d)
+
+
+def revalidate(since=None, dry_run=False, chunk=CHUNK, on_chunk=None):
+    qs = Attendance.objects.all()
+    if since is not None:
+        qs = qs.filter(created_at__gte=since)
+    return Revalidator(chunk=chunk, dry_run=dry_run, on_chunk=on_chunk).run(qs)
@@ -0,0 +1,97 @@
+"""
+Attendance re-validation as background jobs.
+
+A full pass over Attendance takes far longer than a request may, so the
+admin view only queues a RevalidationJob; `manage.py run_revalidation_jobs`
+(started next to gunicorn, like run_import_jobs) claims queued jobs from the
+table and runs revalidate() with the job's parameters. The running counters
+are written to the job row after every chunk, which doubles as a heartbeat:
+a RUNNING job that has not moved for REVALIDATION_JOB_STALE_SECONDS (worker
+died) is claimed again. Each chunk commits with its rollup/calendar changes,
+so running a job again after a crash is safe.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import RevalidationJob
+from .revalidate import revalidate
+
+logger = logging.getLogger(__name__)
+
+
+def create_job(user_id, since=None, dry_run=False):
+    return RevalidationJob.objects.create(created_by_id=user_id, since=since, dry_run=dry_run)
+
+
+def claim_next():
+    stale = timezone.now() - timedelta(seconds=settings.REVALIDATION_JOB_STALE_SECONDS)
+    with transaction.atomic():
+        job = (
+            RevalidationJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(Q(status="QUEUED") | Q(status="RUNNING", updated_at__lt=stale))
+            .order_by("created_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        now = timezone.now()
+        job.status = "RUNNING"
+        job.started_at = now
+        job.updated_at = now
+        job.save(update_fields=["status", "started_at", "updated_at"])
+        return job
+
+
+def _save_progress(job, result, **extra):
+    RevalidationJob.objects.filter(id=job.id).update(
+        rows=result.rows,
+        updated=result.updated,
+        validated=result.validated,
+        impossible_travel=result.impossible_travel,
+        seconds=result.seconds,
+        updated_at=timezone.now(),
+        **extra,
+    )
+
+
+def run_job(job):
+    try:
+        result = revalidate(
+            since=job.since,
+            dry_run=job.dry_run,
+            on_chunk=lambda r: _save_progress(job, r),
+        )
+    except Exception as e:
+        logger.exception("Revalidation job %s failed", job.id)
+        RevalidationJob.objects.filter(id=job.id).update(
+            status="FAILED", detail=f"{type(e).__name__}: {e}"[:2000],
+            finished_at=timezone.now(), updated_at=timezone.now(),
+        )
+        return False
+
+    _save_progress(job, result, status="DONE", finished_at=timezone.now())
+    return True
+
+
+def job_payload(job):
+    return {
+        "id": job.id,
+        "status": job.status,
+        "since": job.since,
+        "dry_run": job.dry_run,
+        "rows": job.rows,
+        "updated": job.updated,
+        "validated": job.validated,
+        "impossible_travel": job.impossible_travel,
+        "seconds": round(job.seconds, 3),
+        "detail": job.detail,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
@@ -0,0 +1,112 @@
+from datetime import date, datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Task, Attendance, TaskReport, Complaint, InternMonthlyStats
+from .utils import local_tz, month_range, next_month
+
+
+COUNTERS = [
+    "tasks_created", "tasks_completed",
+    "attendance_days", "validated_attendance",
+    "reports", "complaints",
+    "rating_sum", "rating_count",
+]
+
+
+def bump(intern_id, when, **deltas):
+    """
+    Apply counter deltas to the intern's row for the month `when` falls in.
+    Tasks are bucketed by their created_at, so completing or rating an old
+    task updates the month it was created in (same as rebuild_month).
+    Attendance is bucketed by work_date, see bump_work_day.
+    """
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+
+    local = timezone.localtime(when, local_tz())
+    stats, _ = InternMonthlyStats.objects.get_or_create(
+        intern_id=intern_id, year=local.year, month=local.month
+    )
+    InternMonthlyStats.objects.filter(pk=stats.pk).update(
+        **{k: _add(k, v) for k, v in deltas.items()},
+        updated_at=timezone.now(),
+    )
+
+
+def bump_work_day(intern_id, day, **deltas):
+    """bump() for attendance, which counts in the month of its work_date (offline check-ins arrive later)."""
+    bump(intern_id, datetime(day.year, day.month, day.day, tzinfo=local_tz()), **deltas)
+
+
+def set_attendance(intern_id, year, month, days, validated):
+    """Overwrite a month's attendance counters (after attendance was deleted)."""
+    InternMonthlyStats.objects.filter(intern_id=intern_id, year=year, month=month).update(
+        attendance_days=days, validated_attendance=validated, updated_at=timezone.now(),
+    )
+
+
+def _add(field, delta):
+    # negative deltas clamp at 0 (counters may predate a backfill)
+    if delta < 0:
+        return Greatest(F(field), -delta) + delta
+    return F(field) + delta
+
+
+def _count_by_intern(qs, **aggregates):
+    # one GROUP BY query -> {intern_id: {name: count}}
+    return {
+        row.pop("intern"): row
+        for row in qs.order_by().values("intern").annotate(**aggregates)
+    }
+
+
+def compute_month(year, month):
+    """Recount a month from the raw tables -> {intern_id: {counter: value}}."""
+    start, end = month_range(year, month)
+    in_month = {"created_at__gte": start, "created_at__lt": end}
+
+    sources = [
+        _count_by_intern(
+            Task.objects.filter(**in_month),
+            tasks_created=Count("id"),
+            tasks_completed=Count("id", filter=Q(status="COMPLETED")),
+            rating_sum=Sum("star_rating", default=0),
+            rating_count=Count("star_rating"),
+        ),
+        _count_by_intern(
+            Attendance.objects.filter(work_date__gte=date(year, month, 1), work_date__lt=date(*next_month(year, month), 1)),
+            attendance_days=Count("id"),
+            validated_attendance=Count("id", filter=Q(location_validated=True)),
+        ),
+        _count_by_intern(TaskReport.objects.filter(**in_month), reports=Count("id")),
+        _count_by_intern(Complaint.objects.filter(**in_month), complaints=Count("id")),
+    ]
+
+    merged = {}
+    for source in sources:
+        for intern_id, counts in source.items():
+            merged.setdefault(intern_id, dict.fromkeys(COUNTERS, 0)).update(counts)
+    return merged
+
+
+@transaction.atomic
+def rebuild_month(year, month):
+    rows = compute_month(year, month)
+    InternMonthlyStats.objects.filter(year=year, month=month).delete()
+    InternMonthlyStats.objects.bulk_create([
+        InternMonthlyStats(intern_id=intern_id, year=year, month=month, **counts)
+        for intern_id, counts in rows.items()
+    ], batch_size=1000)
+    return len(rows)
+
+
+def iter_months(start: date, end: date):
+    y, m = start.year, start.month
+    while (y, m) <= (end.year, end.month):
+        yield y, m
+        y, m = next_month(y, m)
@@ -1,29 +1,37 @@
 from django.urls import path
 
 from .views_admin import (
-    AdminAnalyticsView, AdminActivityLogView,
+    AdminAnalyticsView, AdminActivityLogView, AdminActivityLogStatsView, AdminResponseCacheStatsView,
     AdminAssignmentsData, AdminAssignIntern, AdminUnassignIntern,
-    AdminAttendanceView, AdminComplaintsView, AdminProgressView,
+    AdminAttendanceView, AdminAttendanceRatesView, AdminPresenceView,
+    AdminRevalidateAttendanceView, AdminRevalidationJobView,
+    AdminComplaintsView, AdminProgressView,
     AdminMonthlyReportCSV, AdminMonthlyReportPDF,
 )
 from .views_supervisor import (
     SupervisorInternListView, SupervisorTaskCreate, SupervisorTasks, SupervisorRateTask,
-    SupervisorAttendanceView, SupervisorReportsView,
+    SupervisorAttendanceView, SupervisorAttendanceRatesView, SupervisorPresenceView, SupervisorReportsView,
     SupervisorComplaintList, SupervisorComplaintUpdateStatus,
 )
 from .views_intern import (
     InternMySupervisor, InternMyTasks, InternUpdateTaskStatus, InternSubmitTaskReport,
-    InternMarkAttendance, InternComplaints,
+    InternMarkAttendance, InternAttendanceToday, InternAttendanceBatch, InternComplaints,
 )
 
 urlpatterns = [
     # ADMIN
     path("admin/analytics/", AdminAnalyticsView.as_view()),
     path("admin/activity/", AdminActivityLogView.as_view()),
+    path("admin/activity/stats/", AdminActivityLogStatsView.as_view()),
+    path("admin/cache/stats/", AdminResponseCacheStatsView.as_view()),
     path("admin/assignments/data/", AdminAssignmentsData.as_view()),
     path("admin/assignments/assign/", AdminAssignIntern.as_view()),
     path("admin/assignments/unassign/", AdminUnassignIntern.as_view()),
     path("admin/attendance/", AdminAttendanceView.as_view()),
+    path("admin/presence/", AdminPresenceView.as_view()),
+    path("admin/attendance/rates/", AdminAttendanceRatesView.as_view()),
+    path("admin/attendance/revalidate/", AdminRevalidateAttendanceView.as_view()),
+    path("admin/attendance/revalidate/<int:job_id>/", AdminRevalidationJobView.as_view()),
     path("admin/complaints/", AdminComplaintsView.as_view()),
     path("admin/progress/", AdminProgressView.as_view()),
     path("admin/reports/monthly/csv/", AdminMonthlyReportCSV.as_view()),
@@ -35,6 +43,8 @@ urlpatterns = [
     path("supervisor/tasks/", SupervisorTasks.as_view()),
     path("supervisor/tasks/<int:task_id>/rate/", SupervisorRateTask.as_view()),
     path("supervisor/attendance/", SupervisorAttendanceView.as_view()),
+    path("supervisor/presence/", SupervisorPresenceView.as_view()),
+    path("supervisor/attendance/rates/", SupervisorAttendanceRatesView.as_view()),
     path("supervisor/reports/", SupervisorReportsView.as_view()),
     path("supervisor/complaints/", SupervisorComplaintList.as_view()),
     path("supervisor/complaints/<int:complaint_id>/status/", SupervisorComplaintUpdateStatus.as_view()),
@@ -45,5 +55,7 @@ urlpatterns = [
     path("intern/tasks/<int:task_id>/status/", InternUpdateTaskStatus.as_view()),
     path("intern/tasks/<int:task_id>/report/", InternSubmitTaskReport.as_view()),
     path("intern/attendance/mark/", InternMarkAttendance.as_view()),
+    path("intern/attendance/today/", InternAttendanceToday.as_view()),
+    path("intern/attendance/batch/", InternAttendanceBatch.as_view()),
     path("intern/complaints/", InternComplaints.as_view()),
 ]
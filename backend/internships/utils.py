@@ -1,4 +1,10 @@
+from datetime import datetime
 from math import radians, sin, cos, sqrt, atan2
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
 def haversine_m(lat1, lng1, lat2, lng2):
     R = 6371000.0
@@ -10,3 +16,45 @@ def haversine_m(lat1, lng1, lat2, lng2):
     a = sin(dphi/2)**2 + cos(phi1)*cos(phi2)*sin(dlambda/2)**2
     c = 2 * atan2(sqrt(a), sqrt(1-a))
     return R * c
+
+
+def local_tz():
+    return ZoneInfo(settings.TIME_ZONE)
+
+
+def local_today():
+    """The current date in the configured TIME_ZONE (the attendance work day)."""
+    return timezone.localdate(timezone=local_tz())
+
+
+def day_param(request, name="date"):
+    """?date=YYYY-MM-DD -> date (today if absent), None if malformed."""
+    raw = request.query_params.get(name)
+    if not raw:
+        return local_today()
+    try:
+        return parse_date(raw)
+    except ValueError:
+        return None
+
+
+def month_start(year, month):
+    return datetime(year, month, 1, tzinfo=local_tz())
+
+
+def next_month(year, month):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def month_range(year, month, last_year=None, last_month=None):
+    """
+    Half-open [start, end) datetimes covering a local-time month (or the
+    whole months year/month .. last_year/last_month inclusive).
+
+    Filter with created_at__gte=start, created_at__lt=end instead of
+    created_at__year/__month, which compile to EXTRACT() and can't use
+    an index on created_at.
+    """
+    if last_year is None:
+        last_year, last_month = year, month
+    return month_start(year, month), month_start(*next_month(last_year, last_month))
@@ -1,18 +1,25 @@
 import csv
-import io
 from datetime import datetime
 
-from django.http import HttpResponse
+from django.db.models import Sum
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 
+from accounts.authentication import refresh_claims
 from accounts.models import User
-from .models import Task, Attendance, Complaint, ActivityLog, TaskReport
+from core.cache import bump_scopes, cache_stats, cached_response
+from core.pagination import KeysetPaginator
+from .models import Task, Attendance, Complaint, ActivityLog, TaskReport, InternMonthlyStats, RevalidationJob
 from .permissions import IsAdmin
+from . import attendance_calendar, presence, report_cache, revalidation_jobs
+from .activity import Verb, log_activity, writer as activity_writer
+from .utils import day_param, local_tz, month_range
 
 
 # ==============================
@@ -29,7 +36,19 @@ class AdminAnalyticsView(APIView):
                 "supervisors": User.objects.filter(role="SUPERVISOR").count(),
                 "tasks_total": Task.objects.count(),
                 "complaints_open": Complaint.objects.filter(status="OPEN").count(),
-            }
+            },
+            "monthly": list(
+                InternMonthlyStats.objects
+                .values("year", "month")
+                .annotate(
+                    tasks_created=Sum("tasks_created"),
+                    tasks_completed=Sum("tasks_completed"),
+                    attendance=Sum("attendance_days"),
+                    reports=Sum("reports"),
+                    complaints=Sum("complaints"),
+                )
+                .order_by("year", "month")
+            ),
         })
 
 
@@ -41,18 +60,95 @@ class AdminActivityLogView(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        logs = ActivityLog.objects.select_related("actor").order_by("-created_at")[:200]
-        return Response([
+        """
+        Filters (all optional, combinable):
+          ?actor=<user id or email>  ?verb=TASK_STATUS
+          ?target_type=task&target_id=17
+          ?since=2026-02-01[T09:00]  ?until=2026-03-01  (until is exclusive)
+        """
+        params = request.query_params
+        qs = ActivityLog.objects.select_related("actor")
+
+        actor = (params.get("actor") or "").strip()
+        if actor:
+            if actor.isdigit():
+                qs = qs.filter(actor_id=int(actor))
+            else:
+                actor_id = User.objects.filter(email=actor.lower()).values_list("id", flat=True).first()
+                qs = qs.filter(actor_id=actor_id) if actor_id else qs.none()
+
+        verb = (params.get("verb") or "").strip().upper()
+        if verb:
+            if verb not in ActivityLog.Verb.values:
+                return Response({"detail": f"verb must be one of {', '.join(ActivityLog.Verb.values)}"}, status=400)
+            qs = qs.filter(verb=verb)
+
+        if params.get("target_type"):
+            qs = qs.filter(target_type=params["target_type"].strip().lower())
+        if params.get("target_id"):
+            try:
+                qs = qs.filter(target_id=int(params["target_id"]))
+            except ValueError:
+                return Response({"detail": "target_id must be an integer"}, status=400)
+
+        try:
+            since = _parse_when(params.get("since"))
+            until = _parse_when(params.get("until"))
+        except ValueError:
+            return Response({"detail": "since/until must be YYYY-MM-DD or an ISO datetime"}, status=400)
+        if since:
+            qs = qs.filter(created_at__gte=since)
+        if until:
+            qs = qs.filter(created_at__lt=until)
+
+        page = KeysetPaginator(request, default_size=200)
+        logs = page.paginate(qs)
+        return page.response([
             {
                 "id": log.id,
                 "actor": getattr(log.actor, "email", None),
+                "verb": log.verb,
+                "target_type": log.target_type,
+                "target_id": log.target_id,
+                "payload": log.payload,
                 "action": log.action,
-                "created_at": log.created_at.isoformat(),
+                "created_at": log.created_at,
             }
             for log in logs
         ])
 
 
+def _parse_when(value):
+    """YYYY-MM-DD or ISO datetime -> aware datetime (local TIME_ZONE if naive)."""
+    if not value:
+        return None
+    value = value.strip()
+    dt = parse_datetime(value)
+    if dt is None:
+        d = parse_date(value)
+        if d is None:
+            raise ValueError(value)
+        dt = datetime(d.year, d.month, d.day)
+    if timezone.is_naive(dt):
+        dt = dt.replace(tzinfo=local_tz())
+    return dt
+
+
+class AdminActivityLogStatsView(APIView):
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        # counters are per worker process
+        return Response(activity_writer.stats())
+
+
+class AdminResponseCacheStatsView(APIView):
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
 # ==============================
 # ASSIGNMENT DATA
 # ==============================
@@ -60,6 +156,7 @@ class AdminActivityLogView(APIView):
 class AdminAssignmentsData(APIView):
     permission_classes = [IsAdmin]
 
+    @cached_response("users")
     def get(self, request):
         interns = User.objects.filter(role="INTERN").order_by("full_name")
         supervisors = User.objects.filter(role="SUPERVISOR").order_by("full_name")
@@ -97,12 +194,11 @@ class AdminAssignIntern(APIView):
             return Response({"detail": "User not found"}, status=404)
 
         intern.supervisor = supervisor
-        intern.save(update_fields=["supervisor"])
+        intern.save(update_fields=["supervisor", "updated_at"])
+        bump_scopes("users")
+        refresh_claims(intern.id)
 
-        ActivityLog.objects.create(
-            actor=request.user,
-            action=f"Assigned {intern.email} -> {supervisor.email}"
-        )
+        log_activity(request.user, Verb.INTERN_ASSIGN, intern, {"intern": intern.email, "supervisor": supervisor.email})
 
         return Response({"detail": "Assigned successfully"})
 
@@ -126,12 +222,11 @@ class AdminUnassignIntern(APIView):
             return Response({"detail": "Intern not found"}, status=404)
 
         intern.supervisor = None
-        intern.save(update_fields=["supervisor"])
+        intern.save(update_fields=["supervisor", "updated_at"])
+        bump_scopes("users")
+        refresh_claims(intern.id)
 
-        ActivityLog.objects.create(
-            actor=request.user,
-            action=f"Unassigned {intern.email}"
-        )
+        log_activity(request.user, Verb.INTERN_UNASSIGN, intern, {"intern": intern.email})
 
         return Response({"detail": "Unassigned successfully"})
 
@@ -144,22 +239,92 @@ class AdminAttendanceView(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        records = Attendance.objects.select_related("intern").order_by("-created_at")[:300]
+        page = KeysetPaginator(request, default_size=300)
+        records = page.paginate(Attendance.objects.select_related("intern", "office"))
 
-        return Response([
+        return page.response([
             {
                 "id": a.id,
                 "intern": a.intern.full_name,
                 "email": a.intern.email,
+                "work_date": a.work_date,
                 "in_office": a.in_office,
                 "location_validated": a.location_validated,
                 "distance_m": a.office_distance_m,
-                "created_at": a.created_at.isoformat(),
+                "office": a.office.name if a.office else None,
+                "impossible_travel": a.impossible_travel,
+                "created_at": a.created_at,
             }
             for a in records
         ])
 
 
+class AdminPresenceView(APIView):
+    """?date=YYYY-MM-DD (default today) -> validated / present / absent per intern."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        day = day_param(request)
+        if day is None:
+            return Response({"detail": "date must be YYYY-MM-DD"}, status=400)
+        interns = list(User.objects.filter(role="INTERN").order_by("full_name", "id").values_list("id", "full_name", "email"))
+        return Response(presence.board(day, interns))
+
+
+class AdminAttendanceRatesView(APIView):
+    """
+    ?from=&to= (YYYY-MM-DD, default this month so far) -> attendance rate,
+    streaks and absences per intern; ?intern=<id> also lists absence dates.
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        try:
+            start, end = attendance_calendar.parse_range(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        interns = User.objects.filter(role="INTERN")
+        intern_id = request.query_params.get("intern")
+        if intern_id:
+            if not intern_id.isdigit():
+                return Response({"detail": "intern must be an id"}, status=400)
+            interns = interns.filter(id=intern_id)
+        interns = list(interns.order_by("full_name", "id").values_list("id", "full_name", "email", "created_at"))
+        return Response(attendance_calendar.board(interns, start, end, absences=bool(intern_id)))
+
+
+class AdminRevalidateAttendanceView(APIView):
+    """POST {since?: YYYY-MM-DD, dry_run?: bool} -> 202 + queued job; GET -> recent jobs."""
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        jobs = RevalidationJob.objects.order_by("-created_at", "-id")[:20]
+        return Response([revalidation_jobs.job_payload(j) for j in jobs])
+
+    def post(self, request):
+        since = None
+        if request.data.get("since"):
+            day = parse_date(str(request.data["since"]))
+            if day is None:
+                return Response({"detail": "since must be YYYY-MM-DD"}, status=400)
+            since = datetime(day.year, day.month, day.day, tzinfo=local_tz())
+
+        dry_run = request.data.get("dry_run") in [True, "true", "True", 1, "1"]
+        job = revalidation_jobs.create_job(request.user.id, since=since, dry_run=dry_run)
+        return Response(revalidation_jobs.job_payload(job), status=202)
+
+
+class AdminRevalidationJobView(APIView):
+    permission_classes = [IsAdmin]
+
+    def get(self, request, job_id):
+        job = RevalidationJob.objects.filter(id=job_id).first()
+        if not job:
+            return Response({"detail": "Revalidation job not found."}, status=404)
+        return Response(revalidation_jobs.job_payload(job))
+
+
 # ==============================
 # COMPLAINTS
 # ==============================
@@ -168,16 +333,17 @@ class AdminComplaintsView(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        complaints = Complaint.objects.select_related("intern", "supervisor").order_by("-created_at")[:200]
+        page = KeysetPaginator(request, default_size=200)
+        complaints = page.paginate(Complaint.objects.select_related("intern", "supervisor"))
 
-        return Response([
+        return page.response([
             {
                 "id": c.id,
                 "intern": c.intern.email,
                 "supervisor": c.supervisor.email if c.supervisor else None,
                 "subject": c.subject,
                 "status": c.status,
-                "created_at": c.created_at.isoformat(),
+                "created_at": c.created_at,
             }
             for c in complaints
         ])
@@ -197,31 +363,34 @@ class AdminProgressView(APIView):
         except ValueError:
             return Response({"detail": "Invalid year or month"}, status=400)
 
-        tasks = Task.objects.filter(created_at__year=year, created_at__month=month)
-        attendance = Attendance.objects.filter(date__year=year, date__month=month)
-        reports = TaskReport.objects.filter(created_at__year=year, created_at__month=month)
-        complaints = Complaint.objects.filter(created_at__year=year, created_at__month=month)
+        stats = {
+            row.pop("intern"): row
+            for row in InternMonthlyStats.objects.filter(year=year, month=month).values(
+                "intern", "tasks_created", "tasks_completed", "attendance_days", "reports", "complaints"
+            )
+        }
 
         summary = {
-            "tasks_created": tasks.count(),
-            "tasks_completed": tasks.filter(status="COMPLETED").count(),
-            "attendance_marked": attendance.count(),
-            "reports_submitted": reports.count(),
-            "complaints": complaints.count(),
+            "tasks_created": sum(r["tasks_created"] for r in stats.values()),
+            "tasks_completed": sum(r["tasks_completed"] for r in stats.values()),
+            "attendance_marked": sum(r["attendance_days"] for r in stats.values()),
+            "reports_submitted": sum(r["reports"] for r in stats.values()),
+            "complaints": sum(r["complaints"] for r in stats.values()),
         }
 
         rows = []
-        interns = User.objects.filter(role="INTERN")
+        interns = User.objects.filter(role="INTERN").values_list("id", "full_name", "email")
 
-        for intern in interns:
+        for intern_id, full_name, email in interns:
+            r = stats.get(intern_id, {})
             rows.append({
-                "intern": intern.full_name,
-                "email": intern.email,
-                "tasks_created": tasks.filter(intern=intern).count(),
-                "tasks_completed": tasks.filter(intern=intern, status="COMPLETED").count(),
-                "attendance": attendance.filter(intern=intern).count(),
-                "reports": reports.filter(intern=intern).count(),
-                "complaints": complaints.filter(intern=intern).count(),
+                "intern": full_name,
+                "email": email,
+                "tasks_created": r.get("tasks_created", 0),
+                "tasks_completed": r.get("tasks_completed", 0),
+                "attendance": r.get("attendance_days", 0),
+                "reports": r.get("reports", 0),
+                "complaints": r.get("complaints", 0),
             })
 
         return Response({
@@ -235,42 +404,105 @@ class AdminProgressView(APIView):
 # ==============================
 
 class AdminMonthlyReportCSV(APIView):
+    """
+    Streams all tasks created in one month (?year=&month=) or in a range of
+    whole months (?start=YYYY-MM&end=YYYY-MM, both inclusive).
+    """
     permission_classes = [IsAdmin]
 
-    def get(self, request):
-        year = int(request.query_params.get("year", timezone.now().year))
-        month = int(request.query_params.get("month", timezone.now().month))
-
-        tasks = Task.objects.filter(
-            created_at__year=year,
-            created_at__month=month
-        ).select_related("intern", "supervisor")
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = f'attachment; filename="monthly_report_{year}_{month:02d}.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
-            "Task ID", "Title", "Status",
-            "Intern", "Supervisor",
-            "Rating", "Feedback", "Created At"
-        ])
+    header = [
+        "Task ID", "Title", "Status",
+        "Intern", "Supervisor",
+        "Rating", "Feedback", "Created At"
+    ]
 
-        for t in tasks:
-            writer.writerow([
-                t.id,
-                t.title,
-                t.status,
-                t.intern.full_name if t.intern else "",
-                t.supervisor.full_name if t.supervisor else "",
-                t.star_rating,
-                (t.supervisor_feedback or "").replace("\n", " "),
-                t.created_at,
-            ])
+    def get(self, request):
+        try:
+            start, end, label = _report_period(request.query_params)
+        except ValueError:
+            return Response({"detail": "Invalid year/month or start/end (YYYY-MM)"}, status=400)
+
+        filename = f"monthly_report_{label}.csv"
+        version = report_cache.data_version(start, end)
+        cached = report_cache.open_cached("csv", label, version, "csv")
+        if cached:
+            return FileResponse(cached, as_attachment=True, filename=filename, content_type="text/csv")
+
+        rows = (
+            Task.objects
+            .filter(created_at__gte=start, created_at__lt=end)
+            .order_by("created_at", "id")
+            .values_list(
+                "id", "title", "status",
+                "intern__full_name", "supervisor__full_name",
+                "star_rating", "supervisor_feedback", "created_at",
+            )
+            .iterator(chunk_size=CSV_CHUNK_ROWS)
+        )
 
+        chunks = report_cache.stream_and_store("csv", label, version, "csv", _stream_csv(self.header, rows))
+        response = StreamingHttpResponse(chunks, content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
         return response
 
 
+CSV_CHUNK_ROWS = 2000
+
+
+class _Echo:
+    # csv.writer target that hands the formatted line straight back
+    def write(self, value):
+        return value
+
+
+def _stream_csv(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+
+    chunk = []
+    for task_id, title, status, intern, supervisor, rating, feedback, created_at in rows:
+        chunk.append(writer.writerow([
+            task_id,
+            title,
+            status,
+            intern or "",
+            supervisor or "",
+            rating,
+            (feedback or "").replace("\n", " "),
+            created_at,
+        ]))
+        if len(chunk) >= CSV_CHUNK_ROWS:
+            yield "".join(chunk)
+            chunk = []
+
+    if chunk:
+        yield "".join(chunk)
+
+
+def _report_period(params):
+    """
+    -> (start, end, filename label) as a half-open created_at range.
+    Raises ValueError on bad input.
+    """
+    if params.get("start"):
+        first = datetime.strptime(params["start"], "%Y-%m")
+        last = datetime.strptime(params.get("end") or params["start"], "%Y-%m")
+        if last < first:
+            raise ValueError("end before start")
+        label = f"{first.year}_{first.month:02d}"
+        if last != first:
+            label += f"-{last.year}_{last.month:02d}"
+    else:
+        now = timezone.localtime()
+        first = last = datetime(
+            int(params.get("year", now.year)), int(params.get("month", now.month)), 1
+        )
+        label = f"{first.year}_{first.month:02d}"
+
+    start, end = month_range(first.year, first.month, last.year, last.month)
+    return start, end, label
+
+
 # ==============================
 # MONTHLY PDF EXPORT
 # ==============================
@@ -279,38 +511,51 @@ class AdminMonthlyReportPDF(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request):
-        year = int(request.query_params.get("year", timezone.now().year))
-        month = int(request.query_params.get("month", timezone.now().month))
-
-        tasks = Task.objects.filter(
-            created_at__year=year,
-            created_at__month=month
-        ).select_related("intern", "supervisor")
-
-        buffer = io.BytesIO()
-        pdf = canvas.Canvas(buffer, pagesize=A4)
-        width, height = A4
-
-        y = height - 50
-        pdf.setFont("Helvetica-Bold", 14)
-        pdf.drawString(50, y, f"Monthly Report - {year}-{month:02d}")
-
-        y -= 30
-        pdf.setFont("Helvetica", 10)
-
-        for t in tasks:
-            if y < 50:
-                pdf.showPage()
-                pdf.setFont("Helvetica", 10)
-                y = height - 50
-
-            line = f"#{t.id} | {t.title} | {t.status} | {t.intern.full_name if t.intern else ''}"
-            pdf.drawString(50, y, line[:100])
-            y -= 15
-
-        pdf.save()
-        buffer.seek(0)
-
-        response = HttpResponse(buffer, content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="monthly_report_{year}_{month:02d}.pdf"'
-        return response
\ No newline at end of file
+        try:
+            start, end, label = _report_period(request.query_params)
+        except ValueError:
+            return Response({"detail": "Invalid year/month or start/end (YYYY-MM)"}, status=400)
+
+        filename = f"monthly_report_{label}.pdf"
+        version = report_cache.data_version(start, end)
+        cached = report_cache.open_cached("pdf", label, version, "pdf")
+        if not cached:
+            path = report_cache.store(
+                "pdf", label, version, "pdf",
+                lambda f: _render_pdf(f, label.replace("_", "-"), start, end),
+            )
+            cached = open(path, "rb")
+
+        return FileResponse(cached, as_attachment=True, filename=filename, content_type="application/pdf")
+
+
+def _render_pdf(fileobj, title, start, end):
+    tasks = (
+        Task.objects
+        .filter(created_at__gte=start, created_at__lt=end)
+        .order_by("created_at", "id")
+        .values_list("id", "title", "status", "intern__full_name")
+        .iterator(chunk_size=CSV_CHUNK_ROWS)
+    )
+
+    pdf = canvas.Canvas(fileobj, pagesize=A4)
+    width, height = A4
+
+    y = height - 50
+    pdf.setFont("Helvetica-Bold", 14)
+    pdf.drawString(50, y, f"Monthly Report - {title}")
+
+    y -= 30
+    pdf.setFont("Helvetica", 10)
+
+    for task_id, task_title, status, intern in tasks:
+        if y < 50:
+            pdf.showPage()
+            pdf.setFont("Helvetica", 10)
+            y = height - 50
+
+        line = f"#{task_id} | {task_title} | {status} | {intern or ''}"
+        pdf.drawString(50, y, line[:100])
+        y -= 15
+
+    pdf.save()
@@ -1,28 +1,31 @@
-import math
+from datetime import timedelta
+
+import numpy as np
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from .models import Task, Attendance, Complaint, TaskReport, ActivityLog
+from accounts.models import User
+from core.cache import bump_scopes, cached_response
+from core.etags import etag_matches, list_etag, not_modified, with_etag
+from core.pagination import KeysetPaginator
+from .models import Task, Attendance, Complaint, TaskReport
 from .permissions import IsIntern
 from .serializers import TaskSerializer
-
-
-def haversine_m(lat1, lon1, lat2, lon2):
-    # meters
-    R = 6371000
-    p1 = math.radians(lat1)
-    p2 = math.radians(lat2)
-    d1 = math.radians(lat2 - lat1)
-    d2 = math.radians(lon2 - lon1)
-    a = math.sin(d1/2)**2 + math.cos(p1)*math.cos(p2)*math.sin(d2/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+from .projections import TASK_VALUES, task_rows
+from . import attendance_calendar, geofence, presence, rollups
+from .activity import Verb, log_activities, log_activity
+from .revalidate import SiteMatrix
+from .utils import local_today, local_tz
 
 
 class InternMySupervisor(APIView):
     permission_classes = [IsIntern]
 
+    @cached_response("users")
     def get(self, request):
         sup = getattr(request.user, "supervisor", None)
         if not sup:
@@ -32,10 +35,21 @@ class InternMySupervisor(APIView):
 
 class InternMyTasks(APIView):
     permission_classes = [IsIntern]
+    use_projection = True  # False: TaskSerializer (same output, slower)
 
+    @cached_response("tasks:intern:{user}", "users")
     def get(self, request):
-        qs = Task.objects.filter(intern=request.user).select_related("intern", "supervisor").order_by("-created_at")
-        return Response(TaskSerializer(qs, many=True).data)
+        tasks = Task.objects.filter(intern_id=request.user.id)
+        etag = list_etag(request, tasks, related=("intern", "supervisor"))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        page = KeysetPaginator(request, full=True)
+        if self.use_projection:
+            data = task_rows(page.paginate(tasks.values(*TASK_VALUES)))
+        else:
+            data = TaskSerializer(page.paginate(tasks.select_related("intern", "supervisor")), many=True).data
+        return with_etag(page.response(data), etag)
 
 
 class InternUpdateTaskStatus(APIView):
@@ -47,14 +61,17 @@ class InternUpdateTaskStatus(APIView):
             return Response({"detail": "status must be DONE/IN_PROGRESS/COMPLETED"}, status=400)
 
         try:
-            task = Task.objects.get(id=task_id, intern=request.user)
+            task = Task.objects.get(id=task_id, intern_id=request.user.id)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found"}, status=404)
 
+        was_completed = task.status == "COMPLETED"
         task.status = status_val
-        task.save(update_fields=["status"])
+        task.save(update_fields=["status", "updated_at"])
+        rollups.bump(task.intern_id, task.created_at, tasks_completed=(status_val == "COMPLETED") - was_completed)
+        bump_scopes(f"tasks:intern:{task.intern_id}", f"tasks:supervisor:{task.supervisor_id}")
 
-        ActivityLog.objects.create(actor=request.user, action=f"Updated task {task.id} -> {status_val}")
+        log_activity(request.user, Verb.TASK_STATUS, task, {"status": status_val})
         return Response({"detail": "Updated"})
 
 
@@ -67,16 +84,39 @@ class InternSubmitTaskReport(APIView):
             return Response({"detail": "content required"}, status=400)
 
         try:
-            task = Task.objects.get(id=task_id, intern=request.user)
+            task = Task.objects.get(id=task_id, intern_id=request.user.id)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found"}, status=404)
 
-        r = TaskReport.objects.create(task=task, intern=request.user, content=content)
-        ActivityLog.objects.create(actor=request.user, action=f"Submitted report for task {task.id}")
+        r = TaskReport.objects.create(task=task, intern_id=request.user.id, content=content)
+        rollups.bump(request.user.id, r.created_at, reports=1)
+        log_activity(request.user, Verb.REPORT_SUBMIT, task, {"report_id": r.id})
         return Response({"detail": "Report submitted", "id": r.id})
 
 
+# device clocks drift; allow check-ins slightly "in the future"
+CLIENT_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def _attendance_payload(a, match=None):
+    site = match.site if match else a.office
+    return {
+        "id": a.id,
+        "work_date": a.work_date,
+        "created_at": a.created_at,
+        "in_office": a.in_office,
+        "location_validated": a.location_validated,
+        "office_distance_m": a.office_distance_m,
+        "office": site.name if site else None,
+        "radius_m": site.radius_m if site else None,
+    }
+
+
 class InternMarkAttendance(APIView):
+    """
+    One attendance row per intern per local day: marking again (double tap,
+    client retry) returns the row already recorded instead of adding one.
+    """
     permission_classes = [IsIntern]
 
     def post(self, request):
@@ -84,56 +124,241 @@ class InternMarkAttendance(APIView):
         lat = request.data.get("lat", None)
         lng = request.data.get("lng", None)
 
-        # Office config from settings/.env
-        office_lat = float(getattr(settings, "OFFICE_LAT", 0) or 0)
-        office_lng = float(getattr(settings, "OFFICE_LNG", 0) or 0)
-        radius_m = float(getattr(settings, "OFFICE_RADIUS_M", 150) or 150)
-
         location_validated = False
         dist = None
+        match = None
 
         if in_office in [True, "true", "True", 1, "1"]:
             # if they claim in office, try validate if lat/lng provided
             try:
-                if lat is not None and lng is not None and office_lat and office_lng:
+                if lat is not None and lng is not None:
                     lat = float(lat)
                     lng = float(lng)
-                    dist = haversine_m(lat, lng, office_lat, office_lng)
-                    location_validated = dist <= radius_m
+                    match = geofence.locate(lat, lng)
+                    dist = match.distance_m
+                    location_validated = match.validated
             except Exception:
                 location_validated = False
 
-        a = Attendance.objects.create(
-            intern=request.user,
-            in_office=bool(in_office in [True, "true", "True", 1, "1"]),
-            lat=lat if lat is not None else None,
-            lng=lng if lng is not None else None,
-            location_validated=location_validated,
-            office_distance_m=dist,
-        )
+        with transaction.atomic():
+            # unique (intern, work_date): concurrent taps resolve to the same row
+            a, created = Attendance.objects.select_related("office").get_or_create(
+                intern_id=request.user.id,
+                work_date=local_today(),
+                defaults=dict(
+                    in_office=bool(in_office in [True, "true", "True", 1, "1"]),
+                    lat=lat if lat is not None else None,
+                    lng=lng if lng is not None else None,
+                    location_validated=location_validated,
+                    office_distance_m=dist,
+                    office_id=match.office_id if match else None,
+                ),
+            )
+            if created:
+                rollups.bump_work_day(request.user.id, a.work_date, attendance_days=1, validated_attendance=int(a.location_validated))
+                presence.record(a.work_date, {request.user.id: a.location_validated})
+                attendance_calendar.record_days([(request.user.id, a.work_date, a.location_validated)])
+
+        if created:
+            log_activity(request.user, Verb.ATTENDANCE_MARK, a, {"in_office": a.in_office, "validated": a.location_validated})
+
+        data = _attendance_payload(a, match if created else None)
+        data["already_marked"] = not created
+        return Response(data)
+
+
+class InternAttendanceToday(APIView):
+    permission_classes = [IsIntern]
 
-        ActivityLog.objects.create(actor=request.user, action=f"Marked attendance (in_office={a.in_office}, validated={a.location_validated})")
+    def get(self, request):
+        today = local_today()
+        # single probe of the (intern, work_date) unique index
+        a = Attendance.objects.select_related("office").filter(intern_id=request.user.id, work_date=today).first()
+        if a is None:
+            return Response({"work_date": today, "marked": False})
+        return Response({"marked": True, **_attendance_payload(a)})
+
+
+class InternAttendanceBatch(APIView):
+    """
+    Offline check-ins queued on the device, sent together when it is online:
+
+        POST {"checkins": [{"key": "...", "client_time": ISO-8601,
+                            "in_office": true, "lat": .., "lng": ..}, ...]}
+
+    Each item counts for the local day of its client_time and follows the
+    same once-per-day rule as mark/. Items are validated against the
+    geofence in one vectorized pass and inserted with one bulk_create; the
+    response has one result per item, in order. "created" and "duplicate"
+    are both final (the client can drop them), "invalid" will never succeed.
+    """
+    permission_classes = [IsIntern]
 
-        return Response({
-            "id": a.id,
-            "location_validated": a.location_validated,
-            "office_distance_m": a.office_distance_m,
-            "radius_m": radius_m,
-        })
+    def post(self, request):
+        items = request.data.get("checkins") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({"detail": "checkins must be a non-empty list"}, status=400)
+        max_items = getattr(settings, "ATTENDANCE_BATCH_MAX_ITEMS", 100)
+        if len(items) > max_items:
+            return Response({"detail": f"At most {max_items} checkins per request"}, status=400)
+
+        tz = local_tz()
+        now = timezone.now()
+        oldest = now - timedelta(days=getattr(settings, "ATTENDANCE_BATCH_MAX_AGE_DAYS", 7))
+        results = [None] * len(items)
+        valid = []  # (position, parsed item), first item per work day only
+        days = {}
+
+        for pos, item in enumerate(items):
+            parsed, error = _parse_checkin(item, now, oldest, tz)
+            key = item.get("key") if isinstance(item, dict) else None
+            if error:
+                results[pos] = {"key": key, "status": "invalid", "detail": error}
+            elif parsed["work_date"] in days:
+                results[pos] = {"key": key, "status": "duplicate", "same_as": days[parsed["work_date"]]}
+            else:
+                days[parsed["work_date"]] = parsed["key"]
+                valid.append((pos, parsed))
+
+        if valid:
+            self._ingest(request, valid, results)
+        return Response({"results": results})
+
+    def _ingest(self, request, valid, results):
+        intern_id = request.user.id
+        sites = SiteMatrix(geofence.get_index().sites)
+        lat = np.array([p["lat"] for _, p in valid], dtype=np.float64)
+        lng = np.array([p["lng"] for _, p in valid], dtype=np.float64)
+        claims = np.array([p["in_office"] for _, p in valid], dtype=bool)
+        distance, site, validated = sites.match(lat, lng, claims & ~(np.isnan(lat) | np.isnan(lng)))
+        office = sites.office_ids(site, validated)
+
+        dates = [p["work_date"] for _, p in valid]
+
+        with transaction.atomic():
+            # batches of one intern run one at a time (a retried upload racing the
+            # original must not count its days twice), so `existing` is exact here
+            list(User.objects.select_for_update().filter(id=intern_id).values_list("id"))
+            existing = set(
+                Attendance.objects.filter(intern_id=intern_id, work_date__in=dates).values_list("work_date", flat=True)
+            )
+            rows = [
+                Attendance(
+                    intern_id=intern_id,
+                    work_date=p["work_date"],
+                    client_time=p["client_time"],
+                    client_key=p["key"],
+                    in_office=p["in_office"],
+                    lat=None if np.isnan(lat[i]) else float(lat[i]),
+                    lng=None if np.isnan(lng[i]) else float(lng[i]),
+                    location_validated=bool(validated[i]),
+                    office_distance_m=None if np.isnan(distance[i]) else float(distance[i]),
+                    office_id=None if office[i] < 0 else int(office[i]),
+                )
+                for i, (_, p) in enumerate(valid)
+                if p["work_date"] not in existing
+            ]
+            # a concurrent mark/ may still win a day; ignore_conflicts leaves its row
+            # (client_key "" there, so it is reported as a duplicate below)
+            Attendance.objects.bulk_create(rows, ignore_conflicts=True)
+            stored = {
+                a.work_date: a
+                for a in Attendance.objects.filter(intern_id=intern_id, work_date__in=dates)
+            }
+            created = [
+                stored[p["work_date"]] for _, p in valid
+                if p["work_date"] not in existing and stored[p["work_date"]].client_key == p["key"]
+            ]
+            by_month = {}
+            for a in created:
+                counts = by_month.setdefault(a.work_date.replace(day=1), [0, 0])
+                counts[0] += 1
+                counts[1] += a.location_validated
+            for month, (days, validated_days) in by_month.items():
+                rollups.bump_work_day(intern_id, month, attendance_days=days, validated_attendance=validated_days)
+            for a in created:
+                presence.record(a.work_date, {intern_id: a.location_validated})
+            attendance_calendar.record_days((intern_id, a.work_date, a.location_validated) for a in created)
+
+        created_ids = {a.id for a in created}
+        log_activities(request.user, Verb.ATTENDANCE_MARK, [
+            (a, {"in_office": a.in_office, "validated": a.location_validated, "work_date": str(a.work_date)})
+            for a in created
+        ])
+
+        for i, (pos, p) in enumerate(valid):
+            a = stored[p["work_date"]]
+            result = {
+                "key": p["key"],
+                "status": "created" if a.id in created_ids else "duplicate",
+                "id": a.id,
+                "work_date": a.work_date,
+                "location_validated": a.location_validated,
+                "office_distance_m": a.office_distance_m,
+            }
+            if a.id in created_ids and validated[i]:
+                result["office"] = sites.names[site[i]]
+            results[pos] = result
+
+
+def _parse_checkin(item, now, oldest, tz):
+    if not isinstance(item, dict):
+        return None, "Each checkin must be an object"
+    key = item.get("key")
+    if not isinstance(key, str) or not key.strip() or len(key) > 64:
+        return None, "key is required (max 64 characters)"
+
+    try:
+        client_time = parse_datetime(str(item.get("client_time") or ""))
+    except ValueError:  # well formed but impossible, e.g. 2026-02-30T09:00:00
+        client_time = None
+    if client_time is None:
+        return None, "client_time must be an ISO-8601 datetime"
+    if timezone.is_naive(client_time):
+        client_time = timezone.make_aware(client_time, tz)
+    if client_time > now + CLIENT_CLOCK_SKEW:
+        return None, "client_time is in the future"
+    if client_time < oldest:
+        return None, "client_time is too old"
+
+    lat, lng = item.get("lat"), item.get("lng")
+    try:
+        lat = float("nan") if lat is None else float(lat)
+        lng = float("nan") if lng is None else float(lng)
+    except (TypeError, ValueError):
+        return None, "lat/lng must be numbers"
+    if abs(lat) > 90 or abs(lng) > 180:
+        return None, "lat/lng out of range"
+
+    return {
+        "key": key.strip(),
+        "client_time": client_time,
+        "work_date": timezone.localtime(client_time, tz).date(),
+        "in_office": item.get("in_office", False) in [True, "true", "True", 1, "1"],
+        "lat": lat,
+        "lng": lng,
+    }, None
 
 
 class InternComplaints(APIView):
     permission_classes = [IsIntern]
 
+    @cached_response("complaints:intern:{user}")
     def get(self, request):
-        qs = Complaint.objects.filter(intern=request.user).order_by("-created_at")[:200]
-        return Response([{
+        complaints = Complaint.objects.filter(intern_id=request.user.id)
+        etag = list_etag(request, complaints)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        page = KeysetPaginator(request, default_size=200)
+        qs = page.paginate(complaints)
+        return with_etag(page.response([{
             "id": c.id,
             "subject": c.subject,
             "message": c.message,
             "status": c.status,
-            "created_at": c.created_at.isoformat(),
-        } for c in qs])
+            "created_at": c.created_at,
+        } for c in qs]), etag)
 
     def post(self, request):
         subject = (request.data.get("subject") or "").strip()
@@ -141,14 +366,17 @@ class InternComplaints(APIView):
         if not subject or not message:
             return Response({"detail": "subject and message required"}, status=400)
 
-        supervisor = getattr(request.user, "supervisor", None)
+        # route by the current assignment, the token's supervisor_id may predate it
+        supervisor_id = User.objects.filter(id=request.user.id).values_list("supervisor_id", flat=True).first()
         c = Complaint.objects.create(
-            intern=request.user,
-            supervisor=supervisor,
+            intern_id=request.user.id,
+            supervisor_id=supervisor_id,
             subject=subject,
             message=message,
             status="OPEN",
         )
+        rollups.bump(request.user.id, c.created_at, complaints=1)
+        bump_scopes(f"complaints:intern:{c.intern_id}", f"complaints:supervisor:{c.supervisor_id}")
 
-        ActivityLog.objects.create(actor=request.user, action=f"Created complaint {c.id}")
+        log_activity(request.user, Verb.COMPLAINT_CREATE, c)
         return Response({"detail": "Sent", "id": c.id}, status=201)
@@ -2,17 +2,26 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 
 from accounts.models import User
-from .models import Task, Attendance, Complaint, TaskReport, ActivityLog
+from core.cache import bump_scopes, cached_response
+from core.etags import etag_matches, list_etag, not_modified, with_etag
+from core.pagination import KeysetPaginator
+from .models import Task, Attendance, Complaint, TaskReport
 from .permissions import IsSupervisor
 from .serializers import TaskSerializer
+from .projections import TASK_VALUES, task_rows
+from . import attendance_calendar, presence, rollups
+from .activity import Verb, log_activity
+from .utils import day_param
 
 
 class SupervisorInternListView(APIView):
     permission_classes = [IsSupervisor]
 
+    @cached_response("users")
     def get(self, request):
-        interns = User.objects.filter(role="INTERN", supervisor=request.user).order_by("full_name")
-        return Response([{"id": i.id, "full_name": i.full_name, "email": i.email} for i in interns])
+        page = KeysetPaginator(request, ordering=("full_name", "id"), full=True)
+        interns = page.paginate(User.objects.filter(role="INTERN", supervisor_id=request.user.id))
+        return page.response([{"id": i.id, "full_name": i.full_name, "email": i.email} for i in interns])
 
 
 class SupervisorTaskCreate(APIView):
@@ -27,28 +36,41 @@ class SupervisorTaskCreate(APIView):
             return Response({"detail": "intern and title required"}, status=400)
 
         try:
-            intern = User.objects.get(id=intern_id, role="INTERN", supervisor=request.user)
+            intern = User.objects.get(id=intern_id, role="INTERN", supervisor_id=request.user.id)
         except User.DoesNotExist:
             return Response({"detail": "Intern not found / not assigned to you"}, status=404)
 
         task = Task.objects.create(
-            supervisor=request.user,
+            supervisor_id=request.user.id,
             intern=intern,
             title=title,
             description=description,
             status="IN_PROGRESS",  # default
         )
+        rollups.bump(intern.id, task.created_at, tasks_created=1)
+        bump_scopes(f"tasks:intern:{intern.id}", f"tasks:supervisor:{request.user.id}")
 
-        ActivityLog.objects.create(actor=request.user, action=f"Created task {task.id} for {intern.email}")
+        log_activity(request.user, Verb.TASK_CREATE, task, {"intern": intern.email})
         return Response(TaskSerializer(task).data, status=201)
 
 
 class SupervisorTasks(APIView):
     permission_classes = [IsSupervisor]
+    use_projection = True  # False: TaskSerializer (same output, slower)
 
+    @cached_response("tasks:supervisor:{user}", "users")
     def get(self, request):
-        qs = Task.objects.filter(supervisor=request.user).select_related("intern", "supervisor").order_by("-created_at")
-        return Response(TaskSerializer(qs, many=True).data)
+        tasks = Task.objects.filter(supervisor_id=request.user.id)
+        etag = list_etag(request, tasks, related=("intern", "supervisor"))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        page = KeysetPaginator(request, full=True)
+        if self.use_projection:
+            data = task_rows(page.paginate(tasks.values(*TASK_VALUES)))
+        else:
+            data = TaskSerializer(page.paginate(tasks.select_related("intern", "supervisor")), many=True).data
+        return with_etag(page.response(data), etag)
 
 
 class SupervisorRateTask(APIView):
@@ -67,15 +89,22 @@ class SupervisorRateTask(APIView):
             return Response({"detail": "star_rating must be 1-5"}, status=400)
 
         try:
-            task = Task.objects.get(id=task_id, supervisor=request.user)
+            task = Task.objects.get(id=task_id, supervisor_id=request.user.id)
         except Task.DoesNotExist:
             return Response({"detail": "Task not found"}, status=404)
 
+        previous_rating = task.star_rating
         task.star_rating = star_rating
         task.supervisor_feedback = supervisor_feedback
-        task.save(update_fields=["star_rating", "supervisor_feedback"])
+        task.save(update_fields=["star_rating", "supervisor_feedback", "updated_at"])
+        rollups.bump(
+            task.intern_id, task.created_at,
+            rating_sum=star_rating - (previous_rating or 0),
+            rating_count=int(previous_rating is None),
+        )
+        bump_scopes(f"tasks:intern:{task.intern_id}", f"tasks:supervisor:{task.supervisor_id}")
 
-        ActivityLog.objects.create(actor=request.user, action=f"Rated task {task.id} ({star_rating} stars)")
+        log_activity(request.user, Verb.TASK_RATE, task, {"stars": star_rating})
         return Response({"detail": "Saved"})
 
 
@@ -83,51 +112,97 @@ class SupervisorAttendanceView(APIView):
     permission_classes = [IsSupervisor]
 
     def get(self, request):
-        qs = Attendance.objects.select_related("intern").filter(intern__supervisor=request.user).order_by("-created_at")[:300]
-        return Response([{
+        page = KeysetPaginator(request, default_size=300)
+        qs = page.paginate(Attendance.objects.select_related("intern", "office").filter(intern__supervisor_id=request.user.id))
+        return page.response([{
             "id": a.id,
             "intern": a.intern.full_name,
             "email": a.intern.email,
+            "work_date": a.work_date,
             "in_office": a.in_office,
             "location_validated": a.location_validated,
             "distance_m": a.office_distance_m,
-            "created_at": a.created_at.isoformat(),
+            "office": a.office.name if a.office else None,
+            "impossible_travel": a.impossible_travel,
+            "created_at": a.created_at,
         } for a in qs])
 
 
+class SupervisorPresenceView(APIView):
+    """?date=YYYY-MM-DD (default today) -> validated / present / absent for my interns."""
+    permission_classes = [IsSupervisor]
+
+    def get(self, request):
+        day = day_param(request)
+        if day is None:
+            return Response({"detail": "date must be YYYY-MM-DD"}, status=400)
+        interns = list(
+            User.objects.filter(role="INTERN", supervisor_id=request.user.id)
+            .order_by("full_name", "id").values_list("id", "full_name", "email")
+        )
+        return Response(presence.board(day, interns))
+
+
+class SupervisorAttendanceRatesView(APIView):
+    """Same as admin/attendance/rates/, for my interns."""
+    permission_classes = [IsSupervisor]
+
+    def get(self, request):
+        try:
+            start, end = attendance_calendar.parse_range(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        interns = User.objects.filter(role="INTERN", supervisor_id=request.user.id)
+        intern_id = request.query_params.get("intern")
+        if intern_id:
+            if not intern_id.isdigit():
+                return Response({"detail": "intern must be an id"}, status=400)
+            interns = interns.filter(id=intern_id)
+        interns = list(interns.order_by("full_name", "id").values_list("id", "full_name", "email", "created_at"))
+        return Response(attendance_calendar.board(interns, start, end, absences=bool(intern_id)))
+
+
 class SupervisorReportsView(APIView):
     permission_classes = [IsSupervisor]
 
     def get(self, request):
-        qs = (
+        page = KeysetPaginator(request, default_size=300)
+        qs = page.paginate(
             TaskReport.objects
             .select_related("task", "intern")
-            .filter(task__supervisor=request.user)
-            .order_by("-created_at")[:300]
+            .filter(task__supervisor_id=request.user.id)
         )
-        return Response([{
+        return page.response([{
             "id": r.id,
             "task_id": r.task.id,
             "task_title": r.task.title,
             "intern": r.intern.email,
             "content": r.content,
-            "created_at": r.created_at.isoformat(),
+            "created_at": r.created_at,
         } for r in qs])
 
 
 class SupervisorComplaintList(APIView):
     permission_classes = [IsSupervisor]
 
+    @cached_response("complaints:supervisor:{user}", "users")
     def get(self, request):
-        qs = Complaint.objects.select_related("intern").filter(supervisor=request.user).order_by("-created_at")[:200]
-        return Response([{
+        complaints = Complaint.objects.filter(supervisor_id=request.user.id)
+        etag = list_etag(request, complaints, related=("intern",))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        page = KeysetPaginator(request, default_size=200)
+        qs = page.paginate(complaints.select_related("intern"))
+        return with_etag(page.response([{
             "id": c.id,
             "intern": c.intern.email,
             "subject": c.subject,
             "message": c.message,
             "status": c.status,
-            "created_at": c.created_at.isoformat(),
-        } for c in qs])
+            "created_at": c.created_at,
+        } for c in qs]), etag)
 
 
 class SupervisorComplaintUpdateStatus(APIView):
@@ -139,12 +214,13 @@ class SupervisorComplaintUpdateStatus(APIView):
             return Response({"detail": "status must be OPEN/IN_REVIEW/RESOLVED"}, status=400)
 
         try:
-            c = Complaint.objects.get(id=complaint_id, supervisor=request.user)
+            c = Complaint.objects.get(id=complaint_id, supervisor_id=request.user.id)
         except Complaint.DoesNotExist:
             return Response({"detail": "Complaint not found"}, status=404)
 
         c.status = status_val
-        c.save(update_fields=["status"])
+        c.save(update_fields=["status", "updated_at"])
+        bump_scopes(f"complaints:intern:{c.intern_id}", f"complaints:supervisor:{c.supervisor_id}")
 
-        ActivityLog.objects.create(actor=request.user, action=f"Updated complaint {c.id} -> {status_val}")
+        log_activity(request.user, Verb.COMPLAINT_STATUS, c, {"status": status_val})
         return Response({"detail": "Updated"})
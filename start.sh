@@ -9,6 +9,24 @@ python manage.py migrate --noinput
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+# restart a background worker whenever it exits (crash, lost DB connection, ...)
+supervise() {
+  while true; do
+    "$@" || echo "$* exited with status $?"
+    echo "Restarting in 5s: $*"
+    sleep 5
+  done
+}
+
+echo "Starting email outbox worker..."
+supervise python manage.py send_outbox --loop &
+
+echo "Starting CSV import worker..."
+supervise python manage.py run_import_jobs --loop &
+
+echo "Starting attendance revalidation worker..."
+supervise python manage.py run_revalidation_jobs --loop &
+
 echo "Starting Gunicorn..."
 exec gunicorn backend.wsgi:application \
   --bind 0.0.0.0:${PORT:-8000} \